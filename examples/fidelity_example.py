@@ -1,16 +1,70 @@
-from qibolab import create_platform
-from qibolab.paths import qibolab_folder
+import numpy as np
+
+from qibolab import AcquisitionType, AveragingMode, ExecutionParameters, create_platform
+from qibolab.pulses import PulseSequence
+
+qubits = [1, 2, 3, 4]
+nshots = 3000
 
 # Define platform and load specific runcard
-runcard = qibolab_folder / "runcards" / "tii5q.yml"
-platform = create_platform("tii5q", runcard)
+platform = create_platform("tii5q")
+
+# Prepare all qubits in |0> and in |1> and read them out simultaneously,
+# so that a single multiplexed acquisition is required for each state.
+state0 = PulseSequence()
+state1 = PulseSequence()
+readouts0 = []
+readouts1 = []
+for qubit in qubits:
+    rx_pulse = platform.create_RX_pulse(qubit, start=0)
+    readouts0.append(platform.create_MZ_pulse(qubit, start=0))
+    readouts1.append(platform.create_MZ_pulse(qubit, start=rx_pulse.finish))
+    state0.add(readouts0[-1])
+    state1.add(rx_pulse, readouts1[-1])
+
+options = ExecutionParameters(
+    nshots=nshots,
+    acquisition_type=AcquisitionType.INTEGRATION,
+    averaging_mode=AveragingMode.SINGLESHOT,
+)
 
 # Connects to lab instruments using the details specified in the calibration settings.
 platform.connect()
-# Executes a pulse sequence.
-results = platform.measure_fidelity(qubits=[1, 2, 3, 4], nshots=3000)
+# Executes the pulse sequences.
+results0 = platform.execute_pulse_sequence(state0, options)
+results1 = platform.execute_pulse_sequence(state1, options)
+# Disconnect from the instruments
+platform.disconnect()
+
+# Shots of all qubits as (qubits, nshots) arrays
+iq0 = np.stack([results0[pulse.serial].voltage for pulse in readouts0])
+iq1 = np.stack([results1[pulse.serial].voltage for pulse in readouts1])
+
+# Rotate so that the two states are separated along the real axis,
+# with |0> on the left
+rotation_angle = -np.angle(np.mean(iq1, axis=1) - np.mean(iq0, axis=1))
+rotation = np.exp(1j * rotation_angle)[:, np.newaxis]
+values = np.concatenate([(iq0 * rotation).real, (iq1 * rotation).real], axis=1)
+labels = np.concatenate([np.zeros_like(iq0.real), np.ones_like(iq1.real)], axis=1)
+
+# Scan all thresholds at once: after sorting, the cumulative counts give the
+# number of shots of each state that are assigned to |0> by each threshold
+order = np.argsort(values, axis=1)
+values = np.take_along_axis(values, order, axis=1)
+labels = np.take_along_axis(labels, order, axis=1)
+ground = np.cumsum(1 - labels, axis=1)
+excited = np.cumsum(labels, axis=1)
+fidelities = (ground - excited) / nshots
+best = np.argmax(fidelities, axis=1)
+
+threshold = values[np.arange(len(qubits)), best]
+fidelity = fidelities[np.arange(len(qubits)), best]
+assignment_fidelity = (1 + fidelity) / 2
+
+results = {
+    qubit: (rotation_angle[i], threshold[i], fidelity[i], assignment_fidelity[i])
+    for i, qubit in enumerate(qubits)
+}
 print(
     f"results[qubit] (rotation_angle, threshold, fidelity, assignment_fidelity): {results}"
 )
-# Disconnect from the instruments
-platform.disconnect()
@@ -1,7 +1,10 @@
 import importlib.metadata as im
 import importlib.util
 import os
+from functools import lru_cache
 from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING
 
 from qibo import Circuit
 from qibo.config import raise_error
@@ -11,26 +14,92 @@ from qibolab.execution_parameters import (
     AveragingMode,
     ExecutionParameters,
 )
-from qibolab.platform import Platform
-from qibolab.serialize import PLATFORM
+
+if TYPE_CHECKING:
+    from qibolab.platform import Platform
 
 __version__ = im.version(__package__)
 
 PLATFORMS = "QIBOLAB_PLATFORMS"
 
+_PLATFORM_MODULE_CACHE: dict[str, tuple[int, ModuleType]] = {}
+"""Platform modules already loaded, indexed by file path, together with the
+modification time of the file when it was loaded."""
+
+
+@lru_cache(maxsize=1)
+def _platforms_path(profiles):
+    if profiles is None or not os.path.exists(profiles):
+        raise_error(RuntimeError, f"Profile directory {profiles} does not exist.")
+    return Path(profiles)
+
 
 def get_platforms_path():
     """Get path to repository containing the platforms.
 
     Path is specified using the environment variable QIBOLAB_PLATFORMS.
+    The resolved path is cached per value of the environment variable.
     """
-    profiles = os.environ.get(PLATFORMS)
-    if profiles is None or not os.path.exists(profiles):
-        raise_error(RuntimeError, f"Profile directory {profiles} does not exist.")
-    return Path(profiles)
+    return _platforms_path(os.environ.get(PLATFORMS))
+
+
+@lru_cache(maxsize=1)
+def _available_platforms(path):
+    with os.scandir(path) as entries:
+        return tuple(
+            sorted(
+                entry.name
+                for entry in entries
+                if entry.name[0] not in "_." and entry.is_dir()
+            )
+        )
+
+
+def get_available_platforms() -> tuple:
+    """Names of the platforms contained in the platforms repository.
+
+    The directory listing is cached, use :func:`refresh_platforms` to
+    pick up platforms added after the first call.
+    """
+    return _available_platforms(get_platforms_path())
 
 
-def create_platform(name) -> Platform:
+def refresh_platforms():
+    """Clear the cached platforms path, list of available platforms and
+    loaded platform modules."""
+    _platforms_path.cache_clear()
+    _available_platforms.cache_clear()
+    _PLATFORM_MODULE_CACHE.clear()
+
+
+def _load_platform_module(path: Path) -> ModuleType:
+    """Load the module defining a platform.
+
+    Modules are cached and executed again only if the file was modified.
+    """
+    mtime = path.stat().st_mtime_ns
+    cached = _PLATFORM_MODULE_CACHE.get(str(path))
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    spec = importlib.util.spec_from_file_location("platform", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _PLATFORM_MODULE_CACHE[str(path)] = (mtime, module)
+    return module
+
+
+def __getattr__(name):
+    # ``Platform`` is imported lazily, to avoid loading the whole platform
+    # machinery when importing the package
+    if name == "Platform":
+        from qibolab.platform import Platform
+
+        return Platform
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def create_platform(name) -> "Platform":
     """A platform for executing quantum algorithms.
 
     It consists of a quantum processor QPU and a set of controlling instruments.
@@ -46,14 +115,13 @@ def create_platform(name) -> Platform:
 
         return create_dummy(with_couplers=name == "dummy_couplers")
 
+    from qibolab.serialize import PLATFORM
+
     platform = get_platforms_path() / f"{name}"
     if not platform.exists():
         raise_error(ValueError, f"Platform {name} does not exist.")
 
-    spec = importlib.util.spec_from_file_location("platform", platform / PLATFORM)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module.create()
+    return _load_platform_module(platform / PLATFORM).create()
 
 
 def execute_qasm(circuit: str, platform, initial_state=None, nshots=1000):
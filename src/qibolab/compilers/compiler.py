@@ -15,7 +15,7 @@ from qibolab.compilers.default import (
     u3_rule,
     z_rule,
 )
-from qibolab.pulses import PulseSequence, ReadoutPulse
+from qibolab.pulses import CouplerFluxPulse, PulseSequence, ReadoutPulse
 
 
 @dataclass
@@ -99,9 +99,20 @@ class Compiler:
         return inner
 
     def _compile_gate(
-        self, gate, platform, sequence, virtual_z_phases, moment_start, delays
+        self,
+        gate,
+        platform,
+        sequence,
+        virtual_z_phases,
+        moment_start,
+        delays,
+        finishes,
     ):
-        """Adds a single gate to the pulse sequence."""
+        """Adds a single gate to the pulse sequence.
+
+        ``finishes`` maps each qubit to the finish time of its last pulse
+        in the sequence, and it is updated with the pulses of the gate.
+        """
         rule = self[gate.__class__]
         # get local sequence and phases for the current gate
         gate_sequence, gate_phases = rule(gate, platform)
@@ -110,10 +121,7 @@ class Compiler:
         # determine the right start time based on the availability of the qubits involved
         all_qubits = {*gate_sequence.qubits, *gate.qubits}
         start = max(
-            *[
-                sequence.get_qubit_pulses(qubit).finish + delays[qubit]
-                for qubit in all_qubits
-            ],
+            *[finishes[qubit] + delays[qubit] for qubit in all_qubits],
             moment_start,
         )
         # shift start time and phase according to the global sequence
@@ -122,6 +130,9 @@ class Compiler:
             if not isinstance(pulse, ReadoutPulse):
                 pulse.relative_phase += virtual_z_phases[pulse.qubit]
             sequence.add(pulse)
+            # coupler pulses do not occupy the qubit sharing their name
+            if not isinstance(pulse, CouplerFluxPulse):
+                finishes[pulse.qubit] = max(finishes[pulse.qubit], pulse.finish)
 
         return gate_sequence, gate_phases
 
@@ -141,21 +152,32 @@ class Compiler:
         sequence = PulseSequence()
         # FIXME: This will not work with qubits that have string names
         # TODO: Implement a mapping between circuit qubit ids and platform ``Qubit``s
-        virtual_z_phases = defaultdict(int)
+        virtual_z_phases = defaultdict(float)
 
         measurement_map = {}
         # process circuit gates
         delays = defaultdict(int)
+        # finish times are tracked while compiling, instead of scanning the
+        # growing sequence for every gate
+        finishes = defaultdict(int)
+        sequence_finish = 0
         for moment in circuit.queue.moments:
-            moment_start = sequence.finish
+            moment_start = sequence_finish
             for gate in set(filter(lambda x: x is not None, moment)):
                 if isinstance(gate, gates.Align):
                     for qubit in gate.qubits:
                         delays[qubit] += gate.delay
                     continue
                 gate_sequence, gate_phases = self._compile_gate(
-                    gate, platform, sequence, virtual_z_phases, moment_start, delays
+                    gate,
+                    platform,
+                    sequence,
+                    virtual_z_phases,
+                    moment_start,
+                    delays,
+                    finishes,
                 )
+                sequence_finish = max(sequence_finish, gate_sequence.finish)
                 for qubit in gate.qubits:
                     delays[qubit] = 0
 
@@ -1,36 +1,53 @@
-import json
+import time
 
 import requests
-from qcodes_contrib_drivers.drivers.ERAInstruments import ERASynthPlusPlus
 from qibo.config import log
+from requests.adapters import HTTPAdapter
 
 from qibolab.instruments.oscillator import LocalOscillator
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as json_loads
+
 RECONNECTION_ATTEMPTS = 10
 """Number of times to attempt sending requests to the web server in case of
 failure."""
 TIMEOUT = 10
 """Timeout time for HTTP requests in seconds."""
+RETRY_DELAY = 0.1
+"""Time to wait between consecutive request attempts in seconds."""
+REFERENCE_SOURCES = {"int": 0, "internal": 0, "ext": 1, "external": 1}
+"""Values of ``reference_int_ext`` corresponding to each reference clock
+source."""
+CACHE_TTL = 0.12
+"""Time in seconds for which the last ``readAll`` dump is reused by
+:meth:`qibolab.instruments.erasynth.ERASynthEthernet.get`."""
 
 
 class ERASynthEthernet:
     """ERA ethernet driver that follows the QCoDeS interface.
 
     Controls the instrument via HTTP requests to the instrument's web
-    server.
+    server. Requests are sent through a persistent session, so that the
+    same keep-alive connection is reused for all parameter updates.
     """
 
     def __init__(self, name, address):
         self.name = name
         self.address = address
+        self.url = f"http://{address}/"
+        self._session = requests.Session()
+        self._session.mount(
+            "http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+        )
+        self._cache = None
+        self._cache_ts = 0.0
         self.post("readAll", 1)
         self.post("readDiagnostic", 0)
         self.post("rfoutput", 0)
 
-    @property
-    def url(self):
-        return f"http://{self.address}/"
-
     def post(self, name, value):
         """Post a value to the instrument's web server.
 
@@ -40,45 +57,105 @@ class ERASynthEthernet:
             name: str = The name of the value to post.
             value: str = The value to post.
         """
-        value = str(value)
+        return self.post_many({name: value})
+
+    def post_many(self, values):
+        """Post multiple values to the instrument's web server with a single
+        request.
+
+        Try to post multiple times, waiting for 0.1 seconds between each attempt.
+
+        Args:
+            values (dict): Map from the names of the values to post to the values.
+        """
+        data = {name: str(value) for name, value in values.items()}
+        self._cache = None
         for _ in range(RECONNECTION_ATTEMPTS):
             try:
-                response = requests.post(self.url, data={name: value}, timeout=TIMEOUT)
+                response = self._session.post(self.url, data=data, timeout=TIMEOUT)
                 if response.status_code == 200:
                     return True
                 break
             except (ConnectionError, TimeoutError, requests.exceptions.ReadTimeout):
                 log.info("ERAsynth connection timed out, retrying...")
-        raise ConnectionError(f"Unable to post {name}={value} to {self.name}")
+                time.sleep(RETRY_DELAY)
+        values = ", ".join(f"{name}={value}" for name, value in data.items())
+        raise ConnectionError(f"Unable to post {values} to {self.name}")
 
-    def get(self, name):
-        """Get a value from the instrument's web server.
+    def get_all(self, refresh=False):
+        """Get all values from the instrument's web server.
+
+        The parsed ``readAll`` dump is cached for ``CACHE_TTL`` seconds, so that
+        a burst of :meth:`get` calls requires a single request. The cache is
+        invalidated whenever a value is posted. A copy of the cached values is
+        returned, so that callers are free to modify it.
 
         Try to get multiple times, waiting for 0.1 seconds between each attempt.
 
         Args:
-            name: str = The name of the value to get.
+            refresh (bool): If ``True`` the cache is ignored and the values are
+                downloaded again.
         """
-        if name == "ref_osc_source":
-            value = self.get("reference_int_ext")
-            if value == 1:
-                return "EXT"
-            else:
-                return "INT"
+        return dict(self._read_all(refresh))
+
+    def _read_all(self, refresh=False):
+        """Cached ``readAll`` dump, see :meth:`get_all`."""
+        if (
+            not refresh
+            and self._cache is not None
+            and time.monotonic() - self._cache_ts < CACHE_TTL
+        ):
+            return self._cache
 
         for _ in range(RECONNECTION_ATTEMPTS):
             try:
-                response = requests.post(
+                response = self._session.post(
                     self.url, params={"readAll": 1}, timeout=TIMEOUT
                 )
                 if response.status_code == 200:
-                    # reponse.text is a dictonary in string format, convert it to a dictonary
-                    return json.loads(response.text)[name]
+                    # the response is a dictonary in JSON format, decode the raw bytes
+                    self._cache = json_loads(response.content)
+                    self._cache_ts = time.monotonic()
+                    return self._cache
                 break
             except (ConnectionError, TimeoutError, requests.exceptions.ReadTimeout):
                 log.info("ERAsynth connection timed out, retrying...")
+                time.sleep(RETRY_DELAY)
+
+        raise ConnectionError(f"Unable to get values from {self.name}")
 
-        raise ConnectionError(f"Unable to get {name} from {self.name}")
+    def get(self, name):
+        """Get a value from the instrument's web server.
+
+        Args:
+            name: str = The name of the value to get.
+        """
+        if name == "ref_osc_source":
+            value = self.get("reference_int_ext")
+            if value == 1:
+                return "EXT"
+            else:
+                return "INT"
+
+        return self._read_all()[name]
+
+    @staticmethod
+    def _convert(name, value):
+        """Convert a QCoDeS parameter to the name and value expected by the web
+        server."""
+        if name == "ref_osc_source":
+            try:
+                return "reference_int_ext", REFERENCE_SOURCES[value.lower()]
+            except KeyError:
+                raise ValueError(f"Invalid reference clock source {value}")
+
+        elif name == "frequency":
+            return name, int(value)
+
+        elif name == "power":
+            return name, float(value)
+
+        return name, value
 
     def set(self, name, value):
         """Set a value to the instrument's web server.
@@ -90,22 +167,20 @@ class ERASynthEthernet:
             value: New value to set to the given parameter.
                 The type of value depends on the parameter being updated.
         """
-        if name == "ref_osc_source":
-            if value.lower() in ("int", "internal"):
-                self.post("reference_int_ext", 0)
-            elif value.lower() in ("ext", "external"):
-                self.post("reference_int_ext", 1)
-            else:
-                raise ValueError(f"Invalid reference clock source {value}")
-
-        elif name == "frequency":
-            self.post(name, int(value))
+        self.post(*self._convert(name, value))
 
-        elif name == "power":
-            self.post(name, float(value))
+    def set_many(self, values):
+        """Set multiple values to the instrument's web server with a single
+        request.
 
-        else:
-            self.post(name, value)
+        Args:
+            values (dict): Map from parameter names to new values, following
+                the same conventions as :meth:`set`.
+        """
+        if len(values) > 0:
+            self.post_many(
+                dict(self._convert(name, value) for name, value in values.items())
+            )
 
     def on(self):
         self.post("rfoutput", 1)
@@ -115,6 +190,7 @@ class ERASynthEthernet:
 
     def close(self):
         self.off()
+        self._session.close()
 
 
 class ERA(LocalOscillator):
@@ -131,8 +207,25 @@ class ERA(LocalOscillator):
         super().__init__(name, address, ref_osc_source)
         self.ethernet = ethernet
 
+    @property
+    def connection_attempts(self):
+        # the ethernet driver already retries each of its requests
+        return 1 if self.ethernet else super().connection_attempts
+
+    @property
+    def connection_errors(self):
+        if self.ethernet:
+            return super().connection_errors
+        from pyvisa.errors import VisaIOError
+
+        return super().connection_errors + (VisaIOError,)
+
     def create(self):
         if self.ethernet:
             return ERASynthEthernet(self.name, self.address)
         else:
+            from qcodes_contrib_drivers.drivers.ERAInstruments import (
+                ERASynthPlusPlus,
+            )
+
             return ERASynthPlusPlus(f"{self.name}", f"TCPIP::{self.address}::INSTR")
@@ -34,6 +34,3 @@ class QuicSyn(LocalOscillator):
 
     def create(self):
         return LO_QuicSyn(self.name, self.address)
-
-    def __del__(self):
-        self.disconnect()
@@ -24,6 +24,33 @@ ADC_SAMPLNG_RATE_MHZ = 1966.08
 ICARUSQ_PORT = 8080
 
 
+def _modulate(starts, frequencies, phases, i_envs, q_envs, sampling_rate):
+    """Modulate a batch of pulse envelopes with the same number of samples.
+
+    Arguments:
+        starts (np.ndarray): Starting sample of each pulse.
+        frequencies (np.ndarray): Frequency of each pulse in Hz.
+        phases (np.ndarray): Relative phase of each pulse.
+        i_envs (np.ndarray): I envelopes stacked in an array of shape ``(pulses, samples)``.
+        q_envs (np.ndarray): Q envelopes stacked in an array of shape ``(pulses, samples)``.
+        sampling_rate (float): DAC sampling rate in Hz.
+
+    Returns:
+        Array of shape ``(pulses, samples)`` with the modulated waveforms.
+    """
+    t = (starts[:, np.newaxis] + np.arange(i_envs.shape[1])) / sampling_rate
+    phase = 2 * np.pi * frequencies[:, np.newaxis] * t
+    phase += phases[:, np.newaxis]
+
+    # operate in place, reusing the time and phase buffers for the two terms
+    np.sin(phase, out=t)
+    t *= i_envs
+    np.cos(phase, out=phase)
+    phase *= q_envs
+    t += phase
+    return t
+
+
 @dataclass
 class RFSOCPort(Port):
     name: str
@@ -82,12 +109,13 @@ class RFSOC(Controller):
             options (ExecutionParameters): Execution parameters for readout and repetition.
         """
 
-        waveform_array = {dac.id: np.zeros(dac.max_samples) for dac in self.device.dac}
-
-        dac_end_addr = {dac.id: 0 for dac in self.device.dac}
         dac_sampling_rate = self.device.dac_sampling_rate * 1e6
         dac_sr_ghz = dac_sampling_rate / 1e9
 
+        # waveforms are collected as (dac, start, samples) and accumulated at the end
+        waveforms = []
+        drive_pulses = {}
+
         # We iterate over the seuence of pulses and generate the waveforms for each type of pulses
         for pulse in sequence.pulses:
             if pulse.channel not in self._ports:
@@ -102,19 +130,13 @@ class RFSOC(Controller):
             # TODO: Add envelope support for flux pulses
             if pulse.type == PulseType.FLUX:
                 wfm = i_env
-                end = start + len(wfm)
 
-            # Qubit drive microwave signals
+            # Qubit drive microwave signals are modulated in batches below
             elif pulse.type == PulseType.DRIVE:
-                end = start + len(i_env)
-                t = np.arange(start, end) / dac_sampling_rate
-                cosalpha = np.cos(
-                    2 * np.pi * pulse.frequency * t + pulse.relative_phase
-                )
-                sinalpha = np.sin(
-                    2 * np.pi * pulse.frequency * t + pulse.relative_phase
+                drive_pulses.setdefault(len(i_env), []).append(
+                    (dac, start, pulse.frequency, pulse.relative_phase, i_env, q_env)
                 )
-                wfm = i_env * sinalpha + q_env * cosalpha
+                continue
 
             elif pulse.type == PulseType.READOUT:
                 # For readout pulses, we move the corresponding DAC/ADC pair to the start of the pulse to save memory
@@ -122,15 +144,14 @@ class RFSOC(Controller):
                 adc = self.ports(pulse.channel).adc
                 start = 0
 
-                end = start + len(i_env)
-                t = np.arange(start, end) / dac_sampling_rate
-                cosalpha = np.cos(
-                    2 * np.pi * pulse.frequency * t + pulse.relative_phase
-                )
-                sinalpha = np.sin(
-                    2 * np.pi * pulse.frequency * t + pulse.relative_phase
-                )
-                wfm = i_env * sinalpha + q_env * cosalpha
+                wfm = _modulate(
+                    np.array([start]),
+                    np.array([pulse.frequency]),
+                    np.array([pulse.relative_phase]),
+                    i_env[np.newaxis],
+                    q_env[np.newaxis],
+                    dac_sampling_rate,
+                )[0]
 
                 # First we convert the pulse starting time to number of ADC samples
                 # Then, we convert this number to the number of ADC clock cycles (8 samples per clock cycle)
@@ -172,8 +193,33 @@ class RFSOC(Controller):
                         qunit=pulse.qubit,
                     )
 
+            waveforms.append((dac, start, self.device.dac_max_amplitude * wfm))
+
+        # Drive pulses sharing the same number of samples are modulated together
+        for batch in drive_pulses.values():
+            dacs, starts, frequencies, phases, i_envs, q_envs = zip(*batch)
+            starts = np.array(starts)
+            wfms = _modulate(
+                starts,
+                np.array(frequencies),
+                np.array(phases),
+                np.stack(i_envs),
+                np.stack(q_envs),
+                dac_sampling_rate,
+            )
+            wfms *= self.device.dac_max_amplitude
+            waveforms.extend(zip(dacs, starts, wfms))
+
+        # Buffers are allocated only for the DACs that play pulses,
+        # the others would not be uploaded anyway
+        waveform_array = {}
+        dac_end_addr = {}
+        for dac, start, wfm in waveforms:
+            if dac not in waveform_array:
+                waveform_array[dac] = np.zeros(self.device.dac[dac].max_samples)
+                dac_end_addr[dac] = 0
             end = start + len(wfm)
-            waveform_array[dac][start:end] += self.device.dac_max_amplitude * wfm
+            waveform_array[dac][start:end] += wfm
             dac_end_addr[dac] = max(end >> 4, dac_end_addr[dac])
 
         payload = [
@@ -301,12 +347,11 @@ class RFSOC_RO(RFSOC):
             _, adc = qubit.readout.ports
 
             raw_signal = adc_raw_data[adc]
-            sin = np.sin(2 * np.pi * readout_pulse.frequency * t)
-            cos = np.sin(2 * np.pi * readout_pulse.frequency * t)
+            phasor = np.exp(2j * np.pi * readout_pulse.frequency * t)
 
-            i = np.dot(raw_signal, cos)
-            q = np.dot(raw_signal, sin)
-            singleshot = IntegratedResults(i + 1j * q)
+            # demodulate and integrate both components with a single product,
+            # the real and imaginary parts of the result are i and q
+            singleshot = IntegratedResults(raw_signal @ phasor)
             results[readout_pulse.serial] = (
                 singleshot.average
                 if options.averaging_mode is not AveragingMode.SINGLESHOT
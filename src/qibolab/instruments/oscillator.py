@@ -1,11 +1,24 @@
+import time
+import weakref
 from abc import abstractmethod
 from dataclasses import dataclass, fields
+from functools import lru_cache
 from typing import Optional
 
+from qibo.config import log
+
 from qibolab.instruments.abstract import Instrument, InstrumentSettings
 
 RECONNECTION_ATTEMPTS = 3
 """Number of times to attempt connecting to instrument in case of failure."""
+RECONNECTION_DELAY = 0.1
+"""Time to wait in seconds after the first failed connection attempt.
+
+The delay is doubled after each subsequent failure, up to
+``MAX_RECONNECTION_DELAY``.
+"""
+MAX_RECONNECTION_DELAY = 2.0
+"""Maximum time to wait in seconds between connection attempts."""
 
 
 @dataclass
@@ -28,6 +41,12 @@ class LocalOscillatorSettings(InstrumentSettings):
         }
 
 
+@lru_cache
+def _settings_fields(cls):
+    """Names of the fields of a settings dataclass."""
+    return frozenset(fld.name for fld in fields(cls))
+
+
 def _setter(instrument, parameter, value):
     """Set value of a setting.
 
@@ -37,17 +56,59 @@ def _setter(instrument, parameter, value):
     and it is automatically uploaded after we connect.
     If the new value is the same with the cached value, it is not updated.
     """
-    if getattr(instrument, parameter) != value:
-        setattr(instrument.settings, parameter, value)
-        if instrument.is_connected:
-            instrument.device.set(parameter, value)
+    settings = instrument.settings
+    if getattr(settings, parameter) == value:
+        return
+    setattr(settings, parameter, value)
+    if instrument.is_connected:
+        instrument.device.set(parameter, value)
 
 
-def _property(parameter):
-    """Creates an instrument property."""
-    getter = lambda self: getattr(self.settings, parameter)
-    setter = lambda self, value: _setter(self, parameter, value)
-    return property(getter, setter)
+def _set_many(device, values):
+    """Upload multiple parameter values to a device.
+
+    Devices that can update multiple parameters at once expose a ``set_many``
+    method, which is used to upload all values together. For the rest the
+    values are set one by one.
+    """
+    set_many = getattr(device, "set_many", None)
+    if set_many is not None:
+        set_many(values)
+    else:
+        for parameter, value in values.items():
+            device.set(parameter, value)
+
+
+def _safe_close(device):
+    """Turn off and close a device, logging instead of raising errors.
+
+    Used to release devices that were not explicitly disconnected when
+    the instrument object is garbage collected.
+    """
+    try:
+        device.off()
+        device.close()
+    except Exception as exc:
+        log.warning(f"Unable to close device: {exc}")
+
+
+class _Parameter:
+    """Instrument property backed by the cached settings.
+
+    Reads are served from the settings without querying the device,
+    while writes go through :func:`_setter`.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance.settings, self.name)
+
+    def __set__(self, instance, value):
+        _setter(instance, self.name, value)
 
 
 class LocalOscillator(Instrument):
@@ -58,14 +119,32 @@ class LocalOscillator(Instrument):
     qubits and resonators. They cannot be used to play or sweep pulses.
     """
 
-    frequency = _property("frequency")
-    power = _property("power")
-    ref_osc_source = _property("ref_osc_source")
+    frequency = _Parameter()
+    power = _Parameter()
+    ref_osc_source = _Parameter()
+
+    connection_attempts = RECONNECTION_ATTEMPTS
+    """Number of times :meth:`create` is attempted when connecting."""
+    connection_errors = (OSError,)
+    """Errors raised by :meth:`create` when the device cannot be reached.
+
+    Only these errors lead to a new connection attempt, any other error
+    is raised immediately. ``OSError`` also covers socket and
+    ``requests`` connection errors.
+    """
 
     def __init__(self, name, address, ref_osc_source=None):
         super().__init__(name, address)
         self.device = None
         self.settings = LocalOscillatorSettings(ref_osc_source=ref_osc_source)
+        self._finalizer = None
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, *exc):
+        self.disconnect()
 
     @abstractmethod
     def create(self):
@@ -74,28 +153,50 @@ class LocalOscillator(Instrument):
     def connect(self):
         """Connects to the instrument using the IP address set in the
         runcard."""
-        if not self.is_connected:
-            self.device = self.create()
-            self.is_connected = True
-            if not self.is_connected:
-                raise RuntimeError(f"Unable to connect to {self.name}.")
-        else:
+        if self.is_connected:
             raise RuntimeError(
                 f"There is an open connection to the instrument {self.name}."
             )
 
-        for fld in fields(self.settings):
-            self.sync(fld.name)
+        for attempt in range(self.connection_attempts):
+            try:
+                self.device = self.create()
+                break
+            except self.connection_errors as exc:
+                if attempt == self.connection_attempts - 1:
+                    raise RuntimeError(f"Unable to connect to {self.name}.") from exc
+                log.info(f"Unable to connect to {self.name}, retrying...")
+                time.sleep(min(RECONNECTION_DELAY * 2**attempt, MAX_RECONNECTION_DELAY))
+        self.is_connected = True
+        self._finalizer = weakref.finalize(self, _safe_close, self.device)
+        # only release devices on garbage collection, a script exiting while
+        # connected leaves the output on
+        self._finalizer.atexit = False
+
+        values = {
+            fld.name: getattr(self.settings, fld.name) for fld in fields(self.settings)
+        }
+        missing = [name for name, value in values.items() if value is None]
+        if len(missing) > 0:
+            get_all = getattr(self.device, "get_all", None)
+            snapshot = get_all() if get_all is not None else None
+            for parameter in missing:
+                self.sync(parameter, snapshot)
+        _set_many(
+            self.device,
+            {name: value for name, value in values.items() if value is not None},
+        )
 
         self.device.on()
 
     def disconnect(self):
         if self.is_connected:
+            self._finalizer.detach()
             self.device.off()
             self.device.close()
             self.is_connected = False
 
-    def sync(self, parameter):
+    def sync(self, parameter, snapshot=None):
         """Sync parameter value between our cache and the instrument.
 
         If the parameter value exists in our cache, it is uploaded to the instrument.
@@ -103,10 +204,17 @@ class LocalOscillator(Instrument):
 
         Args:
             parameter (str): Parameter name to be synced.
+            snapshot (dict): Optional values already downloaded from the instrument.
+                If it contains the parameter, it is used instead of querying the
+                instrument.
         """
-        value = getattr(self, parameter)
+        value = getattr(self.settings, parameter)
         if value is None:
-            setattr(self.settings, parameter, self.device.get(parameter))
+            if snapshot is not None and parameter in snapshot:
+                value = snapshot[parameter]
+            else:
+                value = self.device.get(parameter)
+            setattr(self.settings, parameter, value)
         else:
             self.device.set(parameter, value)
 
@@ -120,7 +228,7 @@ class LocalOscillator(Instrument):
             **kwargs: Instrument settings loaded from the runcard.
         """
         type_ = self.__class__
-        _fields = {fld.name for fld in fields(self.settings)}
+        _fields = _settings_fields(type(self.settings))
         for name, value in kwargs.items():
             if name not in _fields:
                 raise KeyError(
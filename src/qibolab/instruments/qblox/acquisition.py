@@ -8,19 +8,22 @@ SAMPLING_RATE = 1
 
 def demodulate(input_i, input_q, frequency):
     """Demodulates and integrates the acquired pulse."""
+    # collect both components in a single complex signal
+    num_samples = len(input_i)
+    signal = np.empty(num_samples, dtype=complex)
+    signal.real = input_i
+    signal.imag = input_q
+
     # DOWN Conversion
     # qblox does not remove the offsets in hardware
-    modulated_i = input_i - np.mean(input_i)
-    modulated_q = input_q - np.mean(input_q)
+    signal -= signal.mean()
 
-    num_samples = modulated_i.shape[0]
+    # demodulation and integration evaluate a single DFT bin of the complex
+    # signal at the readout frequency
     time = np.arange(num_samples)
-    phase = 2 * np.pi * frequency * time / SAMPLING_RATE
-    cosalpha = np.cos(phase)
-    sinalpha = np.sin(phase)
-    demod_matrix = np.sqrt(2) * np.array([[cosalpha, sinalpha], [-sinalpha, cosalpha]])
-    result = np.einsum("ijt,jt->i", demod_matrix, np.stack([modulated_i, modulated_q]))
-    return np.sqrt(2) * result / num_samples
+    phasor = np.exp(-2j * np.pi * frequency * time / SAMPLING_RATE)
+    result = 2 * (signal @ phasor) / num_samples
+    return np.array([result.real, result.imag])
 
 
 @dataclass
@@ -1,12 +1,11 @@
 """Qblox Cluster QCM-RF driver."""
 
-import json
-
 from qblox_instruments.native.generic_func import SequencerStates
 from qblox_instruments.qcodes_drivers.cluster import Cluster
 from qblox_instruments.qcodes_drivers.module import Module
 from qibo.config import log
 
+from qibolab.instruments.qblox.debug import print_readable_snapshot, save_sequence
 from qibolab.instruments.qblox.module import ClusterModule
 from qibolab.instruments.qblox.q1asm import (
     Block,
@@ -180,6 +179,8 @@ class QcmRf(ClusterModule):
 
         elif cluster is not None:
             self.device = cluster.modules[int(self.address.split(":")[1]) - 1]
+            # sequences uploaded before the last reset are no longer loaded
+            self._uploaded_sequences = {}
             # test connection with module
             if not self.device.present():
                 raise ConnectionError(
@@ -703,7 +704,7 @@ class QcmRf(ClusterModule):
                 }
 
                 # Upload dictionary to the device sequencers
-                self.device.sequencers[sequencer.number].sequence(qblox_dict[sequencer])
+                self._upload_sequence(sequencer.number, qblox_dict[sequencer])
 
                 # DEBUG: QCM RF Save sequence to file
                 if self._debug_folder != "":
@@ -711,9 +712,7 @@ class QcmRf(ClusterModule):
                         self._debug_folder
                         + f"Z_{self.name}_sequencer{sequencer.number}_sequence.json"
                     )
-                    with open(filename, "w", encoding="utf-8") as file:
-                        json.dump(qblox_dict[sequencer], file, indent=4)
-                        file.write(sequencer.program)
+                    save_sequence(filename, qblox_dict[sequencer], sequencer.program)
 
         # Arm sequencers
         for sequencer_number in self._used_sequencers_numbers:
@@ -724,8 +723,6 @@ class QcmRf(ClusterModule):
         # self.device.print_readable_snapshot(update=True)
 
         # DEBUG: QCM RF Save Readable Snapshot
-        from qibolab.instruments.qblox.debug import print_readable_snapshot
-
         if self._debug_folder != "":
             filename = self._debug_folder + f"Z_{self.name}_snapshot.json"
             with open(filename, "w", encoding="utf-8") as file:
@@ -1,6 +1,5 @@
 """Qblox Cluster QRM-RF driver."""
 
-import json
 import time
 
 import numpy as np
@@ -13,6 +12,7 @@ from qibolab.pulses import Pulse, PulseSequence, PulseType
 from qibolab.sweeper import Parameter, Sweeper, SweeperType
 
 from .acquisition import AveragedAcquisition, DemodulatedAcquisition
+from .debug import print_readable_snapshot, save_sequence
 from .module import ClusterModule
 from .q1asm import Block, Register, convert_phase, loop_block, wait_block
 from .sequencer import Sequencer, WaveformsBuffer
@@ -196,6 +196,8 @@ class QrmRf(ClusterModule):
 
         elif cluster is not None:
             self.device = cluster.modules[int(self.address.split(":")[1]) - 1]
+            # sequences uploaded before the last reset are no longer loaded
+            self._uploaded_sequences = {}
             # test connection with module
             if not self.device.present():
                 raise ConnectionError(
@@ -898,16 +900,14 @@ class QrmRf(ClusterModule):
                 }
 
                 # Upload dictionary to the device sequencers
-                self.device.sequencers[sequencer.number].sequence(qblox_dict[sequencer])
+                self._upload_sequence(sequencer.number, qblox_dict[sequencer])
                 # DEBUG: QRM RF Save sequence to file
                 if self._debug_folder != "":
                     filename = (
                         self._debug_folder
                         + f"Z_{self.name}_sequencer{sequencer.number}_sequence.json"
                     )
-                    with open(filename, "w", encoding="utf-8") as file:
-                        json.dump(qblox_dict[sequencer], file, indent=4)
-                        file.write(sequencer.program)
+                    save_sequence(filename, qblox_dict[sequencer], sequencer.program)
 
         # Clear acquisition memory and arm sequencers
         for sequencer_number in self._used_sequencers_numbers:
@@ -919,8 +919,6 @@ class QrmRf(ClusterModule):
         # self.device.print_readable_snapshot(update=True)
 
         # DEBUG: QRM RF Save Readable Snapshot
-        from qibolab.instruments.qblox.debug import print_readable_snapshot
-
         if self._debug_folder != "":
             filename = self._debug_folder + f"Z_{self.name}_snapshot.json"
             with open(filename, "w", encoding="utf-8") as file:
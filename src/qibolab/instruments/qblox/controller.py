@@ -10,6 +10,7 @@ from qibolab.instruments.abstract import Controller
 from qibolab.instruments.qblox.cluster_qcm_bb import QcmBb
 from qibolab.instruments.qblox.cluster_qcm_rf import QcmRf
 from qibolab.instruments.qblox.cluster_qrm_rf import QrmRf
+from qibolab.instruments.qblox.q1asm import convert_phase
 from qibolab.instruments.qblox.sequencer import SAMPLING_RATE
 from qibolab.pulses import PulseSequence, PulseType
 from qibolab.result import SampleResults
@@ -421,8 +422,6 @@ class QbloxController(Controller):
                         ValueError,
                         "relative_phase sweeps other than ABSOLUTE are not supported by qblox yet",
                     )
-                from qibolab.instruments.qblox.q1asm import convert_phase
-
                 c_values = np.array([convert_phase(v) for v in sweeper.values])
                 if any(np.diff(c_values) < 0):
                     split_relative_phase = True
@@ -1,5 +1,34 @@
+import json
+
 import numpy as np
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def save_sequence(filename, sequence: dict, program: str) -> None:
+    """Saves the sequence uploaded to a sequencer to a file.
+
+    The sequence dictionary is written in indented JSON format, followed
+    by the q1asm program. When available, ``orjson`` is used to serialize
+    the waveforms, which is considerably faster than the standard library.
+
+    Args:
+        filename (str): path of the file to write.
+        sequence (dict): dictionary containing waveforms, weights, acquisitions
+            and program, as uploaded to the sequencer.
+        program (str): q1asm program of the sequencer.
+    """
+    if orjson is not None:
+        data = orjson.dumps(sequence, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(sequence, indent=4).encode("utf-8")
+    with open(filename, "wb") as file:
+        file.write(data)
+        file.write(program.encode("utf-8"))
+
 
 def print_readable_snapshot(
     device, file, update: bool = False, max_chars: int = 80
@@ -32,6 +32,7 @@ class ClusterModule(Instrument):
     def __init__(self, name: str, address: str):
         super().__init__(name, address)
         self._ports: dict = {}
+        self._uploaded_sequences: dict = {}
 
     def ports(self, name: str, out: bool = True):
         """Adds an entry to the dictionary `self._ports` with key 'name' and
@@ -59,3 +60,20 @@ class ClusterModule(Instrument):
         port_cls = QbloxOutputPort if out else QbloxInputPort
         self._ports[name] = port_cls(self, port_number=count(port_cls), port_name=name)
         return self._ports[name]
+
+    def _upload_sequence(self, number: int, sequence: dict):
+        """Uploads a sequence to one of the sequencers of the module.
+
+        The upload is skipped if the same sequence (waveforms, weights,
+        acquisitions and program) is already loaded in the sequencer,
+        which is common when the same pulse sequence is executed multiple
+        times, for example in calibration loops.
+
+        Args:
+            number (int): number of the sequencer.
+            sequence (dict): sequence dictionary in qblox format.
+        """
+        if self._uploaded_sequences.get(number) == sequence:
+            return
+        self.device.sequencers[number].sequence(sequence)
+        self._uploaded_sequences[number] = sequence
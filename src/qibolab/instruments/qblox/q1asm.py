@@ -1,5 +1,7 @@
 """A library to support generating qblox q1asm programs."""
 
+from functools import lru_cache
+
 import numpy as np
 
 END_OF_LINE = "\n"
@@ -185,21 +187,20 @@ class Register:
         self._name = value
 
 
-def wait_block(
-    wait_time: int, register: Register, force_multiples_of_four: bool = False
-):
-    """Generates blocks of code to implement long delays.
+@lru_cache
+def _decompose_wait(wait_time: int):
+    """Decomposes a delay into ``n_loops * loop_wait + wait``.
+
+    The decomposition depends only on the total time to wait, which is
+    usually the same for all the sequences of an experiment, so it is
+    computed only once for each value.
 
     Arguments:
         wait_time (int): the total time to wait.
-        register (:class:`qibolab.instruments.qblox.qblox_q1asm.Register`): the register used to loop
-        force_multiples_of_four (bool): a flag that forces the delay to be a multiple of 4(ns)
-    """
-    n_loops: int
-    loop_wait: int
-    wait: int
-    block = Block()
 
+    Returns:
+        A tuple ``(n_loops, loop_wait, wait)``.
+    """
     # constrains
     # extra_wait and wait_loop_step need to be within (4,65535) (2**16 bits variable)
     # extra_wait and wait_loop_step need to be multiples of 4ns *
@@ -208,20 +209,15 @@ def wait_block(
         raise ValueError("wait_time must be positive.")
 
     elif wait_time == 0:
-        n_loops = 0
-        loop_wait = 0
-        wait = 0
+        return 0, 0, 0
 
     elif wait_time > 0 and wait_time < 4:
         # TODO: log("wait_time > 0 and wait_time < 4 is not supported by the instrument, wait_time changed to 4ns")
-        n_loops = 0
-        loop_wait = 0
-        wait = 4
+        return 0, 0, 4
 
     elif wait_time >= 4 and wait_time < 2**16:  # 65536ns
-        n_loops = 0
-        loop_wait = 0
-        wait = wait_time
+        return 0, 0, wait_time
+
     elif wait_time >= 2**16 and wait_time < 2**32:  # 4.29s
         loop_wait = 2**16 - 4
         n_loops = wait_time // loop_wait
@@ -236,8 +232,23 @@ def wait_block(
             raise ValueError(
                 f"Unable to decompose {wait_time} into valid (n_loops * loop_wait + wait)"
             )
-    else:
-        raise ValueError("wait_time > 65535**2 is not supported yet.")
+        return n_loops, loop_wait, wait
+
+    raise ValueError("wait_time > 65535**2 is not supported yet.")
+
+
+def wait_block(
+    wait_time: int, register: Register, force_multiples_of_four: bool = False
+):
+    """Generates blocks of code to implement long delays.
+
+    Arguments:
+        wait_time (int): the total time to wait.
+        register (:class:`qibolab.instruments.qblox.qblox_q1asm.Register`): the register used to loop
+        force_multiples_of_four (bool): a flag that forces the delay to be a multiple of 4(ns)
+    """
+    block = Block()
+    n_loops, loop_wait, wait = _decompose_wait(wait_time)
 
     if force_multiples_of_four:
         wait = int(np.ceil(wait / 4)) * 4
@@ -1,4 +1,5 @@
 import qcodes.instrument_drivers.rohde_schwarz.SGS100A as LO_SGS100A
+from pyvisa.errors import VisaIOError
 
 from qibolab.instruments.oscillator import LocalOscillator
 
@@ -10,6 +11,8 @@ class SGS100A(LocalOscillator):
     https://qcodes.github.io/Qcodes/api/generated/qcodes.instrument_drivers.rohde_schwarz.html#module-qcodes.instrument_drivers.rohde_schwarz.SGS100A
     """
 
+    connection_errors = LocalOscillator.connection_errors + (VisaIOError,)
+
     def create(self):
         return LO_SGS100A.RohdeSchwarz_SGS100A(
             self.name, f"TCPIP0::{self.address}::5025::SOCKET"
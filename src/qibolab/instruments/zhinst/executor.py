@@ -1,12 +1,16 @@
 """Executing pulse sequences on a Zurich Instruments devices."""
 
+import hashlib
 import re
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
+from contextlib import ExitStack
 from dataclasses import dataclass, replace
 from typing import Any, Optional
 
 import laboneq.simple as lo
 import numpy as np
+from laboneq.dsl.serialization import Serializer
 from qibo.config import log
 
 from qibolab import AcquisitionType, AveragingMode, ExecutionParameters
@@ -45,6 +49,52 @@ AVERAGING_MODE = {
     AveragingMode.SINGLESHOT: lo.AveragingMode.SINGLE_SHOT,
 }
 
+PLAY_PARAMETERS = {
+    Parameter.amplitude: "amplitude",
+    Parameter.duration: "length",
+    Parameter.relative_phase: "phase",
+}
+"""Arguments of laboneq ``play`` swept by each pulse parameter."""
+SPECTROSCOPY_PARAMETERS = frozenset({Parameter.frequency, Parameter.amplitude})
+"""Parameters that require spectroscopy acquisition when swept on readout
+pulses."""
+
+CHANNEL_NODE_PATTERN = re.compile(r"(.*)/(\d)/")
+"""Pattern splitting a channel node path into the instrument path and the
+channel index."""
+COMPILED_CACHE_SIZE = 8
+"""Maximum number of compiled experiments kept for reuse."""
+AUTO_UID_PATTERN = re.compile(r'"(uid|\$ref)":"((?:p|par|osc_)\d+)"')
+"""Pattern matching the identifiers of pulses, sweep parameters and
+oscillators generated by laboneq, which differ between otherwise identical
+experiments."""
+
+
+def _fingerprint(experiment: lo.Experiment, calibration: lo.Calibration) -> str:
+    """Digest identifying what is compiled for an experiment.
+
+    Generated identifiers are renumbered in order of appearance, so that
+    experiments built again from the same sequence and sweeps share the
+    same digest.
+    """
+    serial = Serializer.to_json(experiment) + Serializer.to_json(calibration)
+    uids = {}
+
+    def renumber(match):
+        uid = uids.setdefault(match.group(2), f"#{len(uids)}")
+        return f'"{match.group(1)}":"{uid}"'
+
+    serial = AUTO_UID_PATTERN.sub(renumber, serial)
+    return hashlib.sha256(serial.encode()).hexdigest()
+
+
+def _timings(pulses: list[ZhPulse]) -> tuple[np.ndarray, np.ndarray]:
+    """Start and finish times of a channel's pulses, as two arrays."""
+    n = len(pulses)
+    starts = np.fromiter((p.pulse.start for p in pulses), dtype=float, count=n)
+    finishes = np.fromiter((p.pulse.finish for p in pulses), dtype=float, count=n)
+    return starts, finishes
+
 
 @dataclass
 class ZhPort(Port):
@@ -92,6 +142,8 @@ class Zurich(Controller):
         self.device_setup = device_setup
         self.session = None
         "Zurich device parameters for connection"
+        self._node_paths: Optional[dict[str, str]] = None
+        "Instrument node paths indexed by the path of the connected logical signal"
 
         self.time_of_flight = time_of_flight
         self.smearing = smearing
@@ -100,6 +152,8 @@ class Zurich(Controller):
         self.experiment = None
         self.results = None
         "Zurich experiment definitions"
+        self._compiled_experiments = OrderedDict()
+        "Compiled experiments indexed by fingerprint, from the least recently used"
 
         self.bounds = Bounds(
             waveforms=int(4e4),
@@ -130,12 +184,16 @@ class Zurich(Controller):
             # To fully remove logging #configure_logging=False
             # I strongly advise to set it to 20 to have time estimates of the experiment duration!
             self.session = lo.Session(self.device_setup, log_level=20)
+            self._node_paths = None
+            self._compiled_experiments.clear()
             _ = self.session.connect()
             self.is_connected = True
 
     def disconnect(self):
         if self.is_connected:
             _ = self.session.disconnect()
+            self._node_paths = None
+            self._compiled_experiments.clear()
             self.is_connected = False
 
     def calibration_step(self, qubits, couplers, options):
@@ -293,10 +351,21 @@ class Zurich(Controller):
         self.experiment.save("saved_exp")
         - Save a experiment compiled experiment ():
         self.exp.save("saved_exp")  # saving compiled experiment
+
+        Compiled experiments are cached, and the compilation is skipped
+        when the same experiment is played again with the same calibration.
         """
-        compiled_experiment = self.session.compile(
-            self.experiment, compiler_settings=COMPILER_SETTINGS
-        )
+        key = _fingerprint(self.experiment, self.calibration)
+        compiled_experiment = self._compiled_experiments.get(key)
+        if compiled_experiment is None:
+            compiled_experiment = self.session.compile(
+                self.experiment, compiler_settings=COMPILER_SETTINGS
+            )
+            self._compiled_experiments[key] = compiled_experiment
+            if len(self._compiled_experiments) > COMPILED_CACHE_SIZE:
+                self._compiled_experiments.popitem(last=False)
+        else:
+            self._compiled_experiments.move_to_end(key)
         self.results = self.session.run(compiled_experiment)
 
     @staticmethod
@@ -304,13 +373,14 @@ class Zurich(Controller):
         """Gets the frequencies from the pulses to the qubits."""
         for pulse in sequence:
             qubit = qubits[pulse.qubit]
-            if pulse.type is PulseType.READOUT:
+            ptype = pulse.type
+            if ptype is PulseType.READOUT:
                 qubit.readout_frequency = pulse.frequency
-            if pulse.type is PulseType.DRIVE:
+            elif ptype is PulseType.DRIVE:
                 qubit.drive_frequency = pulse.frequency
 
     def create_sub_sequences(
-        self, qubits: list[Qubit]
+        self, qubits: Iterable[Qubit]
     ) -> tuple[list[SubSequence], set[str]]:
         """Create subsequences based on locations of measurements.
 
@@ -318,21 +388,23 @@ class Zurich(Controller):
         were not split
         """
         measure_channels = {measure_channel_name(qb) for qb in qubits}
-        other_channels = set(self.sequence.keys()) - measure_channels
+        other_channels = self.sequence.keys() - measure_channels
 
         measurement_groups = defaultdict(list)
         for ch in measure_channels:
             for i, pulse in enumerate(self.sequence[ch]):
                 measurement_groups[i].append((ch, pulse))
 
-        measurement_start_end = {}
-        for i, group in measurement_groups.items():
-            starts = np.array([meas.pulse.start for _, meas in group])
-            ends = np.array([meas.pulse.finish for _, meas in group])
-            measurement_start_end[i] = (
-                max(starts),
-                max(ends),
-            )  # max is intended for float arithmetic errors only
+        # the ith measurement of each channel belongs to the ith group, so the
+        # times of each channel are reduced into the leading group entries
+        # max is intended for float arithmetic errors only
+        measurement_starts = np.full(len(measurement_groups), -np.inf)
+        measurement_ends = np.full(len(measurement_groups), -np.inf)
+        for ch in measure_channels:
+            starts, ends = _timings(self.sequence[ch])
+            n = len(starts)
+            np.maximum(measurement_starts[:n], starts, out=measurement_starts[:n])
+            np.maximum(measurement_ends[:n], ends, out=measurement_ends[:n])
 
         # FIXME: this is a hotfix specifically made for any flux experiments in flux pulse mode, where the flux
         # pulses extend through the entire duration of the experiment. This should be removed once the sub-sequence
@@ -343,21 +415,26 @@ class Zurich(Controller):
                 for pulse in self.sequence[ch]:
                     if not isinstance(pulse.pulse, FluxPulse):
                         break
-                    start, end = measurement_start_end[0]
+                    start, end = measurement_starts[0], measurement_ends[0]
                     if pulse.pulse.start < end and pulse.pulse.finish > start:
                         channels_overlapping_measurement.add(ch)
                         break
 
         # split non-measurement channels according to the locations of the measurements
-        sub_sequences = defaultdict(lambda: defaultdict(list))
+        # the last entry collects the control pulses after the last measurement
+        sub_sequences = [{} for _ in range(len(measurement_groups) + 1)]
         for ch in other_channels - channels_overlapping_measurement:
-            measurement_index = 0
-            for pulse in self.sequence[ch]:
-                start, _ = measurement_start_end[measurement_index]
-                if pulse.pulse.finish > start:
-                    measurement_index += 1
-                sub_sequences[measurement_index][ch].append(pulse)
-        if len(sub_sequences) > len(measurement_groups):
+            pulses = self.sequence[ch]
+            _, finishes = _timings(pulses)
+            # a pulse belongs to the sub-sequence after the last measurement that
+            # starts before it finishes, and never to an earlier one than the
+            # pulses preceding it
+            indices = np.maximum.accumulate(
+                np.searchsorted(measurement_starts, finishes, side="left")
+            )
+            for pulse, measurement_index in zip(pulses, indices.tolist()):
+                sub_sequences[measurement_index].setdefault(ch, []).append(pulse)
+        if len(sub_sequences[-1]) > 0:
             log.warning("There are control pulses after the last measurement start.")
 
         return [
@@ -384,7 +461,7 @@ class Zurich(Controller):
         """
         self.sequence = self.sequence_zh(sequence, qubits)
         self.sub_sequences, self.unsplit_channels = self.create_sub_sequences(
-            list(qubits.values())
+            qubits.values()
         )
         self.calibration_step(qubits, couplers, options)
         self.create_exp(qubits, options)
@@ -405,22 +482,25 @@ class Zurich(Controller):
         """
         # Define and assign the sequence
         zhsequence = defaultdict(list)
+        measure_channels = {}
+        processed_sweeps = self.processed_sweeps
+        readout = PulseType.READOUT
 
         # Fill the sequences with pulses according to their lines in temporal order
         for pulse in sequence:
-            if pulse.type == PulseType.READOUT:
-                ch = measure_channel_name(qubits[pulse.qubit])
+            if pulse.type is readout:
+                ch = measure_channels.get(pulse.qubit)
+                if ch is None:
+                    ch = measure_channels[pulse.qubit] = measure_channel_name(
+                        qubits[pulse.qubit]
+                    )
             else:
                 ch = pulse.channel
-            zhsequence[ch].append(ZhPulse(pulse))
-
-        if self.processed_sweeps:
-            for ch, zhpulses in zhsequence.items():
-                for zhpulse in zhpulses:
-                    for param, sweep in self.processed_sweeps.sweeps_for_pulse(
-                        zhpulse.pulse
-                    ):
-                        zhpulse.add_sweeper(param, sweep)
+            zhpulse = ZhPulse(pulse)
+            if processed_sweeps:
+                for param, sweep in processed_sweeps.sweeps_for_pulse(pulse):
+                    zhpulse.add_sweeper(param, sweep)
+            zhsequence[ch].append(zhpulse)
 
         return zhsequence
 
@@ -460,10 +540,7 @@ class Zurich(Controller):
         for i, sweeper in enumerate(self.nt_sweeps):
             ctx = exp.sweep(
                 uid=f"nt_sweep_{sweeper.parameter.name.lower()}_{i}",
-                parameter=[
-                    sweep_param
-                    for sweep_param in self.processed_sweeps.sweeps_for_sweeper(sweeper)
-                ],
+                parameter=self.processed_sweeps.sweeps_for_sweeper(sweeper),
             )
             sweep_contexts.append((sweeper, ctx))
 
@@ -478,10 +555,7 @@ class Zurich(Controller):
         for i, sweeper in enumerate(self.rt_sweeps):
             ctx = exp.sweep(
                 uid=f"rt_sweep_{sweeper.parameter.name.lower()}_{i}",
-                parameter=[
-                    sweep_param
-                    for sweep_param in self.processed_sweeps.sweeps_for_sweeper(sweeper)
-                ],
+                parameter=self.processed_sweeps.sweeps_for_sweeper(sweeper),
                 reset_oscillator_phase=True,
             )
             sweep_contexts.append((sweeper, ctx))
@@ -495,34 +569,28 @@ class Zurich(Controller):
         exp_options: ExecutionParameters,
         contexts,
     ):
-        """Recursively activate the nested contexts, then define the main
-        experiment body inside the innermost context."""
-        if len(contexts) == 0:
+        """Activate the nested contexts, then define the main experiment body
+        inside the innermost context."""
+        nt_sweeps = {id(sweeper) for sweeper in self.nt_sweeps}
+        with ExitStack() as stack:
+            for sweeper, ctx in contexts:
+                stack.enter_context(ctx)
+                if id(sweeper) in nt_sweeps:
+                    self.set_instrument_nodes_for_nt_sweep(exp, sweeper)
             self.select_exp(exp, qubits, exp_options)
-            return
-
-        sweeper, ctx = contexts[0]
-        with ctx:
-            if sweeper in self.nt_sweeps:
-                self.set_instrument_nodes_for_nt_sweep(exp, sweeper)
-            self._populate_exp(qubits, exp, exp_options, contexts[1:])
 
     def set_calibration_for_rt_sweep(self, exp: lo.Experiment) -> None:
         """Set laboneq calibration of parameters that are to be swept in real-
         time."""
         if self.processed_sweeps:
             calib = lo.Calibration()
-            for ch in (
-                set(self.sequence.keys()) | self.processed_sweeps.channels_with_sweeps()
-            ):
-                for param, sweep_param in self.processed_sweeps.sweeps_for_channel(ch):
-                    if param is Parameter.frequency:
-                        calib[ch] = lo.SignalCalibration(
-                            oscillator=lo.Oscillator(
-                                frequency=sweep_param,
-                                modulation_type=lo.ModulationType.HARDWARE,
-                            )
-                        )
+            for ch, sweep_param in self.processed_sweeps.channel_frequency_sweeps():
+                calib[ch] = lo.SignalCalibration(
+                    oscillator=lo.Oscillator(
+                        frequency=sweep_param,
+                        modulation_type=lo.ModulationType.HARDWARE,
+                    )
+                )
             exp.set_calibration(calib)
 
     def set_instrument_nodes_for_nt_sweep(
@@ -543,21 +611,26 @@ class Zurich(Controller):
 
             # This is supposed to happen only for measurement, but we do not validate it here.
             if param is Parameter.amplitude:
-                a, b = re.match(r"(.*)/(\d)/.*", channel_node_path).groups()
+                a, b = CHANNEL_NODE_PATTERN.match(channel_node_path).groups()
                 gain_node_path = f"{a}/{b}/oscs/{b}/gain"
                 exp.set_node(path=gain_node_path, value=sweep_param)
 
     def get_channel_node_path(self, channel_name: str) -> str:
         """Return the path of the instrument node corresponding to the given
         channel."""
-        logical_signal = self.signal_map[channel_name]
-        for instrument in self.device_setup.instruments:
-            for conn in instrument.connections:
-                if conn.remote_path == logical_signal.path:
-                    return f"{instrument.address}/{conn.local_port}"
-        raise RuntimeError(
-            f"Could not find instrument node corresponding to channel {channel_name}"
-        )
+        if self._node_paths is None:
+            self._node_paths = {}
+            for instrument in self.device_setup.instruments:
+                for conn in instrument.connections:
+                    self._node_paths.setdefault(
+                        conn.remote_path, f"{instrument.address}/{conn.local_port}"
+                    )
+        try:
+            return self._node_paths[self.signal_map[channel_name].path]
+        except KeyError:
+            raise RuntimeError(
+                f"Could not find instrument node corresponding to channel {channel_name}"
+            )
 
     def select_exp(self, exp, qubits, exp_options):
         """Build Zurich Experiment selecting the relevant sections."""
@@ -568,7 +641,14 @@ class Zurich(Controller):
                     exp.delay(signal=ch, time=pulse.pulse.start)
                     self.play_sweep(exp, ch, pulse)
 
+        smearing = self.smearing * NANO_TO_SECONDS
+        time_of_flight = self.time_of_flight * NANO_TO_SECONDS
+        relaxation_time = exp_options.relaxation_time * NANO_TO_SECONDS
+        discrimination = (
+            exp_options.acquisition_type == lo.AcquisitionType.DISCRIMINATION
+        )
         weights = {}
+        acquire_channels = {}
         previous_section = None
         for i, seq in enumerate(self.sub_sequences):
             section_uid = f"control_{i}"
@@ -578,13 +658,9 @@ class Zurich(Controller):
                     for pulse in pulses:
                         if pulse.delay_sweeper:
                             exp.delay(signal=ch, time=pulse.delay_sweeper)
-                        exp.delay(
-                            signal=ch,
-                            time=round(pulse.pulse.start * NANO_TO_SECONDS, 9) - time,
-                        )
-                        time = round(pulse.pulse.duration * NANO_TO_SECONDS, 9) + round(
-                            pulse.pulse.start * NANO_TO_SECONDS, 9
-                        )
+                        start = round(pulse.pulse.start * NANO_TO_SECONDS, 9)
+                        exp.delay(signal=ch, time=start - time)
+                        time = round(pulse.pulse.duration * NANO_TO_SECONDS, 9) + start
                         if pulse.zhsweepers:
                             self.play_sweep(exp, ch, pulse)
                         else:
@@ -595,12 +671,16 @@ class Zurich(Controller):
                             )
             previous_section = section_uid
 
-            if any(m.delay_sweeper is not None for _, m in seq.measurements):
+            delays = [
+                (ch, m.delay_sweeper)
+                for ch, m in seq.measurements
+                if m.delay_sweeper is not None
+            ]
+            if len(delays) > 0:
                 section_uid = f"measurement_delay_{i}"
                 with exp.section(uid=section_uid, play_after=previous_section):
-                    for ch, m in seq.measurements:
-                        if m.delay_sweeper:
-                            exp.delay(signal=ch, time=m.delay_sweeper)
+                    for ch, delay_sweeper in delays:
+                        exp.delay(signal=ch, time=delay_sweeper)
                 previous_section = section_uid
 
             section_uid = f"measure_{i}"
@@ -608,73 +688,54 @@ class Zurich(Controller):
                 for ch, pulse in seq.measurements:
                     qubit = qubits[pulse.pulse.qubit]
                     q = qubit.name
-
-                    exp.delay(
-                        signal=acquire_channel_name(qubit),
-                        time=self.smearing * NANO_TO_SECONDS,
-                    )
-
-                    if (
-                        qubit.kernel is not None
-                        and exp_options.acquisition_type
-                        == lo.AcquisitionType.DISCRIMINATION
-                    ):
-                        weight = lo.pulse_library.sampled_pulse_complex(
-                            samples=qubit.kernel * np.exp(1j * qubit.iq_angle),
-                        )
-
-                    else:
-                        if i == 0:
-                            if (
-                                exp_options.acquisition_type
-                                == lo.AcquisitionType.DISCRIMINATION
-                            ):
-                                weight = lo.pulse_library.sampled_pulse_complex(
-                                    samples=np.ones(
-                                        [
-                                            int(
-                                                pulse.pulse.duration * 2
-                                                - 3 * self.smearing * NANO_TO_SECONDS
-                                            )
-                                        ]
-                                    )
-                                    * np.exp(1j * qubit.iq_angle),
-                                )
-                                weights[q] = weight
-                            else:
-                                weight = lo.pulse_library.const(
-                                    length=round(
-                                        pulse.pulse.duration * NANO_TO_SECONDS, 9
-                                    )
-                                    - 1.5 * self.smearing * NANO_TO_SECONDS,
-                                    amplitude=1,
-                                )
-
-                                weights[q] = weight
-                        elif i != 0:
-                            weight = weights[q]
+                    acquire_ch = acquire_channels.get(q)
+                    if acquire_ch is None:
+                        acquire_ch = acquire_channels[q] = acquire_channel_name(qubit)
+                    duration = round(pulse.pulse.duration * NANO_TO_SECONDS, 9)
+
+                    exp.delay(signal=acquire_ch, time=smearing)
+
+                    # weights are built for the first measurement of each qubit
+                    # and reused for the following ones
+                    weight = weights.get(q)
+                    if weight is None:
+                        if qubit.kernel is not None and discrimination:
+                            weight = lo.pulse_library.sampled_pulse_complex(
+                                samples=qubit.kernel * np.exp(1j * qubit.iq_angle),
+                            )
+                        elif discrimination:
+                            weight = lo.pulse_library.sampled_pulse_complex(
+                                samples=np.full(
+                                    int(pulse.pulse.duration * 2 - 3 * smearing),
+                                    np.exp(1j * qubit.iq_angle),
+                                ),
+                            )
+                        else:
+                            weight = lo.pulse_library.const(
+                                length=duration - 1.5 * smearing,
+                                amplitude=1,
+                            )
+                        weights[q] = weight
 
                     measure_pulse_parameters = {"phase": 0}
 
-                    if i == len(self.sequence[measure_channel_name(qubit)]) - 1:
-                        reset_delay = exp_options.relaxation_time * NANO_TO_SECONDS
+                    if i == len(self.sequence[ch]) - 1:
+                        reset_delay = relaxation_time
                     else:
                         reset_delay = 0
 
                     exp.measure(
-                        acquire_signal=acquire_channel_name(qubit),
+                        acquire_signal=acquire_ch,
                         handle=f"sequence{q}_{i}",
                         integration_kernel=weight,
                         integration_kernel_parameters=None,
                         integration_length=None,
-                        measure_signal=measure_channel_name(qubit),
+                        measure_signal=ch,
                         measure_pulse=pulse.zhpulse,
-                        measure_pulse_length=round(
-                            pulse.pulse.duration * NANO_TO_SECONDS, 9
-                        ),
+                        measure_pulse_length=duration,
                         measure_pulse_parameters=measure_pulse_parameters,
                         measure_pulse_amplitude=None,
-                        acquire_delay=self.time_of_flight * NANO_TO_SECONDS,
+                        acquire_delay=time_of_flight,
                         reset_delay=reset_delay,
                     )
             previous_section = section_uid
@@ -684,15 +745,16 @@ class Zurich(Controller):
         """Play Zurich pulse when a single sweeper is involved."""
         play_parameters = {}
         for p, zhs in pulse.zhsweepers:
+            key = PLAY_PARAMETERS.get(p)
+            if key is None:
+                continue
             if p is Parameter.amplitude:
-                max_value = max(np.abs(zhs.values))
+                max_value = np.abs(zhs.values).max()
                 pulse.zhpulse.amplitude *= max_value
-                zhs.values /= max_value
-                play_parameters["amplitude"] = zhs
-            if p is Parameter.duration:
-                play_parameters["length"] = zhs
-            if p is Parameter.relative_phase:
-                play_parameters["phase"] = zhs
+                # rebind instead of dividing in place, as the values may be
+                # shared with the qibolab sweeper
+                zhs.values = zhs.values / max_value
+            play_parameters[key] = zhs
         if "phase" not in play_parameters:
             play_parameters["phase"] = pulse.pulse.relative_phase
 
@@ -708,25 +770,25 @@ class Zurich(Controller):
 
         self.acquisition_type = None
         for sweeper in sweepers:
-            if sweeper.parameter in {Parameter.frequency, Parameter.amplitude}:
-                for pulse in sweeper.pulses:
-                    if pulse.type is PulseType.READOUT:
-                        self.acquisition_type = lo.AcquisitionType.SPECTROSCOPY
+            if sweeper.parameter in SPECTROSCOPY_PARAMETERS and any(
+                pulse.type is PulseType.READOUT for pulse in sweeper.pulses or ()
+            ):
+                self.acquisition_type = lo.AcquisitionType.SPECTROSCOPY
+                break
 
         self.experiment_flow(qubits, couplers, sequence, options)
         self.run_exp()
 
         #  Get the results back
         results = {}
+        discrimination = options.acquisition_type is AcquisitionType.DISCRIMINATION
         for qubit in qubits.values():
             q = qubit.name  # pylint: disable=C0103
             for i, ropulse in enumerate(self.sequence[measure_channel_name(qubit)]):
-                data = self.results.get_data(f"sequence{q}_{i}")
+                data = np.asarray(self.results.get_data(f"sequence{q}_{i}"))
 
-                if options.acquisition_type is AcquisitionType.DISCRIMINATION:
-                    data = (
-                        np.ones(data.shape) - data.real
-                    )  # Probability inversion patch
+                if discrimination:
+                    data = 1.0 - data.real  # Probability inversion patch
 
                 serial = ropulse.pulse.serial
                 qubit = ropulse.pulse.qubit
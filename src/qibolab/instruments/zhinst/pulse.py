@@ -1,5 +1,6 @@
 """Wrapper for qibolab and laboneq pulses and sweeps."""
 
+from collections import OrderedDict
 from typing import Optional
 
 import laboneq.simple as lo
@@ -14,66 +15,96 @@ from qibolab.sweeper import Parameter
 
 from .util import NANO_TO_SECONDS, SAMPLING_RATE
 
+SAMPLED_PULSE_CACHE_SIZE = 1024
+"""Maximum number of sampled laboneq pulses kept for reuse."""
+
+_SAMPLED_PULSES = OrderedDict()
+"""Sampled laboneq pulses indexed by their samples, ordered from the least
+recently used."""
+
+
+def _sampled_pulse(samples: np.ndarray):
+    """Return a sampled laboneq pulse playing the given samples.
+
+    Pulses with the same samples are shared, as they are never modified
+    after creation.
+    """
+    key = (samples.dtype.str, samples.tobytes())
+    zhpulse = _SAMPLED_PULSES.get(key)
+    if zhpulse is None:
+        if np.iscomplexobj(samples):
+            zhpulse = sampled_pulse_complex(samples=samples, can_compress=True)
+        else:
+            zhpulse = sampled_pulse_real(samples=samples, can_compress=True)
+        _SAMPLED_PULSES[key] = zhpulse
+        if len(_SAMPLED_PULSES) > SAMPLED_PULSE_CACHE_SIZE:
+            _SAMPLED_PULSES.popitem(last=False)
+    else:
+        _SAMPLED_PULSES.move_to_end(key)
+    return zhpulse
+
 
 def select_pulse(pulse: Pulse):
     """Return laboneq pulse object corresponding to the given qibolab pulse."""
-    if isinstance(pulse.shape, Rectangular):
+    shape = pulse.shape
+    length = round(pulse.duration * NANO_TO_SECONDS, 9)
+    if isinstance(shape, Rectangular):
         can_compress = pulse.type is not PulseType.READOUT
         return lo.pulse_library.const(
-            length=round(pulse.duration * NANO_TO_SECONDS, 9),
+            length=length,
             amplitude=pulse.amplitude,
             can_compress=can_compress,
         )
-    if isinstance(pulse.shape, Gaussian):
-        sigma = pulse.shape.rel_sigma
+    if isinstance(shape, Gaussian):
+        sigma = shape.rel_sigma
         return lo.pulse_library.gaussian(
-            length=round(pulse.duration * NANO_TO_SECONDS, 9),
+            length=length,
             amplitude=pulse.amplitude,
             sigma=2 / sigma,
             zero_boundaries=False,
         )
 
-    if isinstance(pulse.shape, GaussianSquare):
-        sigma = pulse.shape.rel_sigma
-        width = pulse.shape.width
+    if isinstance(shape, GaussianSquare):
+        sigma = shape.rel_sigma
+        width = shape.width
         can_compress = pulse.type is not PulseType.READOUT
         return lo.pulse_library.gaussian_square(
-            length=round(pulse.duration * NANO_TO_SECONDS, 9),
-            width=round(pulse.duration * NANO_TO_SECONDS, 9) * width,
+            length=length,
+            width=length * width,
             amplitude=pulse.amplitude,
             can_compress=can_compress,
             sigma=2 / sigma,
             zero_boundaries=False,
         )
 
-    if isinstance(pulse.shape, Drag):
-        sigma = pulse.shape.rel_sigma
-        beta = pulse.shape.beta
+    if isinstance(shape, Drag):
+        sigma = shape.rel_sigma
+        beta = shape.beta
         return lo.pulse_library.drag(
-            length=round(pulse.duration * NANO_TO_SECONDS, 9),
+            length=length,
             amplitude=pulse.amplitude,
             sigma=2 / sigma,
             beta=beta,
             zero_boundaries=False,
         )
 
-    if np.all(pulse.envelope_waveform_q(SAMPLING_RATE).data == 0):
-        return sampled_pulse_real(
-            samples=pulse.envelope_waveform_i(SAMPLING_RATE).data,
-            can_compress=True,
-        )
-    else:
-        return sampled_pulse_complex(
-            samples=pulse.envelope_waveform_i(SAMPLING_RATE).data
-            + (1j * pulse.envelope_waveform_q(SAMPLING_RATE).data),
-            can_compress=True,
-        )
+    # sampled pulses: evaluate each envelope only once
+    samples_i = pulse.envelope_waveform_i(SAMPLING_RATE).data
+    samples_q = pulse.envelope_waveform_q(SAMPLING_RATE).data
+    if not samples_q.any():
+        return _sampled_pulse(samples_i)
+    samples = np.empty(len(samples_i), dtype=complex)
+    samples.real = samples_i
+    samples.imag = samples_q
+    return _sampled_pulse(samples)
 
 
 class ZhPulse:
     """Wrapper data type that holds a qibolab pulse, the corresponding laboneq
     pulse object, and any sweeps associated with this pulse."""
 
+    __slots__ = ("pulse", "zhpulse", "zhsweepers", "delay_sweeper")
+
     def __init__(self, pulse):
         self.pulse: Pulse = pulse
         """Qibolab pulse."""
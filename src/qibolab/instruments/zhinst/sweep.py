@@ -1,7 +1,7 @@
 """Pre-execution processing of sweeps."""
 
+from collections import defaultdict
 from collections.abc import Iterable
-from copy import copy
 
 import laboneq.simple as lo
 import numpy as np
@@ -20,8 +20,10 @@ def classify_sweepers(
     can be done in real-time (i.e. on hardware)"""
     nt_sweepers, rt_sweepers = [], []
     for sweeper in sweepers:
-        if sweeper.parameter is Parameter.bias or (
-            sweeper.parameter is Parameter.amplitude
+        parameter = sweeper.parameter
+        if parameter is Parameter.bias or (
+            parameter is Parameter.amplitude
+            and sweeper.pulses
             and sweeper.pulses[0].type is PulseType.READOUT
         ):
             nt_sweepers.append(sweeper)
@@ -108,7 +110,7 @@ class ProcessedSweeps:
                         )
                     )
                 else:
-                    sweep_param = lo.SweepParameter(values=copy(sweeper.values))
+                    sweep_param = lo.SweepParameter(values=sweeper.values)
                     pulse_sweeps.append((pulse, sweeper.parameter, sweep_param))
                 parallel_sweeps.append((sweeper, sweep_param))
 
@@ -136,29 +138,55 @@ class ProcessedSweeps:
                 )
                 parallel_sweeps.append((sweeper, sweep_param))
 
+        # the lists also keep alive the pulses and sweepers whose ids are used
+        # as keys below
         self._pulse_sweeps = pulse_sweeps
         self._channel_sweeps = channel_sweeps
         self._parallel_sweeps = parallel_sweeps
 
+        # index the sweeps, so that each lookup does not scan all of them
+        # pulses and sweepers are indexed by identity, as they are mutable
+        self._by_pulse = defaultdict(list)
+        for pulse, param, sweep_param in pulse_sweeps:
+            self._by_pulse[id(pulse)].append((param, sweep_param))
+        self._by_channel = defaultdict(list)
+        for ch, param, sweep_param in channel_sweeps:
+            self._by_channel[ch].append((param, sweep_param))
+        self._channels_with_sweeps = frozenset(self._by_channel)
+        self._frequency_sweeps = [
+            (ch, sweep_param)
+            for ch, param, sweep_param in channel_sweeps
+            if param is Parameter.frequency
+        ]
+        self._by_sweeper = defaultdict(list)
+        sweeper_by_param = {}
+        for sweeper, sweep_param in parallel_sweeps:
+            self._by_sweeper[id(sweeper)].append(sweep_param)
+            sweeper_by_param[id(sweep_param)] = id(sweeper)
+        self._channel_sweeps_by_sweeper = defaultdict(list)
+        for ch, param, sweep_param in channel_sweeps:
+            self._channel_sweeps_by_sweeper[sweeper_by_param[id(sweep_param)]].append(
+                (ch, param, sweep_param)
+            )
+
     def sweeps_for_pulse(
         self, pulse: Pulse
     ) -> list[tuple[Parameter, lo.SweepParameter]]:
-        return [item[1:] for item in self._pulse_sweeps if item[0] == pulse]
+        return list(self._by_pulse.get(id(pulse), ()))
 
     def sweeps_for_channel(self, ch: str) -> list[tuple[Parameter, lo.SweepParameter]]:
-        return [item[1:] for item in self._channel_sweeps if item[0] == ch]
+        return list(self._by_channel.get(ch, ()))
 
     def sweeps_for_sweeper(self, sweeper: Sweeper) -> list[lo.SweepParameter]:
-        return [item[1] for item in self._parallel_sweeps if item[0] == sweeper]
+        return list(self._by_sweeper.get(id(sweeper), ()))
 
     def channel_sweeps_for_sweeper(
         self, sweeper: Sweeper
     ) -> list[tuple[str, Parameter, lo.SweepParameter]]:
-        return [
-            item
-            for item in self._channel_sweeps
-            if item[2] in self.sweeps_for_sweeper(sweeper)
-        ]
+        return list(self._channel_sweeps_by_sweeper.get(id(sweeper), ()))
+
+    def channels_with_sweeps(self) -> frozenset[str]:
+        return self._channels_with_sweeps
 
-    def channels_with_sweeps(self) -> set[str]:
-        return {ch for ch, _, _ in self._channel_sweeps}
+    def channel_frequency_sweeps(self) -> list[tuple[str, lo.SweepParameter]]:
+        return list(self._frequency_sweeps)
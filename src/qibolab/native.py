@@ -241,7 +241,7 @@ class NativeSequence:
         """Creates a :class:`qibolab.pulses.PulseSequence` object implementing
         the sequence."""
         sequence = PulseSequence()
-        virtual_z_phases = defaultdict(int)
+        virtual_z_phases = defaultdict(float)
 
         for pulse in self.pulses:
             if isinstance(pulse, NativePulse):
@@ -334,7 +334,11 @@ class Platform:
 
     def create_RX90_pulse(self, qubit, start=0, relative_phase=0):
         qubit = self.get_qubit(qubit)
-        return self.qubits[qubit].native_gates.RX90.pulse(start, relative_phase)
+        # equivalent to ``native_gates.RX90.pulse``, without copying the
+        # native RX pulse just to halve its amplitude
+        pulse = self.qubits[qubit].native_gates.RX.pulse(start, relative_phase)
+        pulse.amplitude = pulse.amplitude / 2.0
+        return pulse
 
     def create_RX_pulse(self, qubit, start=0, relative_phase=0):
         qubit = self.get_qubit(qubit)
@@ -412,8 +416,7 @@ class Platform:
 
     def create_RX90_drag_pulse(self, qubit, start, beta, relative_phase=0):
         """Create native RX90 pulse with Drag shape."""
-        qubit = self.get_qubit(qubit)
-        pulse = self.qubits[qubit].native_gates.RX90.pulse(start, relative_phase)
+        pulse = self.create_RX90_pulse(qubit, start, relative_phase)
         pulse.shape = Drag(rel_sigma=pulse.shape.rel_sigma, beta=beta)
         pulse.shape.pulse = pulse
         return pulse
@@ -3,8 +3,10 @@
 import copy
 import re
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
 import numpy as np
@@ -17,6 +19,84 @@ SAMPLING_RATE = 1
 Used for generating waveform envelopes if the instruments do not provide
 a different value.
 """
+WAVEFORM_CACHE_BYTES = 64 * 2**20
+"""Maximum memory in bytes taken by the samples kept in the waveform cache.
+
+The least recently used waveforms are dropped when the limit is
+exceeded.
+"""
+MAX_CACHED_WAVEFORM_BYTES = 2**20
+"""Maximum memory in bytes taken by the samples of a single pair of i and q
+waveforms for it to be cached.
+
+Long waveforms are generated every time, so that they do not evict many
+shorter ones.
+"""
+
+_WAVEFORM_CACHE = OrderedDict()
+"""Samples and serials of the waveforms already generated, indexed by the
+parameters they depend on and ordered from the least recently used."""
+_waveform_cache_bytes = 0
+"""Memory in bytes currently taken by the samples in the waveform cache."""
+SHAPE_NAME_PATTERN = re.compile(r"(\w+)")
+"""Pattern matching the name of a shape in its string representation."""
+SHAPE_PARAMETER_PATTERN = re.compile(r"[-\w+\d\.\d]+")
+"""Pattern matching the name and each parameter of a shape in its string
+representation."""
+
+
+def _cached_waveforms(key, generate):
+    """Return the i and q waveforms identified by ``key``, generating them
+    only if they are not cached.
+
+    Waveforms are cached as read-only arrays and each call returns new
+    :class:`qibolab.pulses.Waveform` objects holding a copy of the samples,
+    so that modifying them does not affect the cache.
+
+    Args:
+        key (tuple): Hashable parameters determining the waveforms, or ``None``
+            if they cannot be cached.
+        generate (callable): Function generating the pair of waveforms.
+    """
+    global _waveform_cache_bytes
+
+    if key is None:
+        return generate()
+
+    cached = _WAVEFORM_CACHE.get(key)
+    if cached is None:
+        generated = generate()
+        nbytes = sum(np.asarray(waveform.data).nbytes for waveform in generated)
+        if nbytes > MAX_CACHED_WAVEFORM_BYTES:
+            return generated
+
+        cached = []
+        for waveform in generated:
+            data = np.array(waveform.data)
+            data.flags.writeable = False
+            cached.append((data, waveform.serial))
+        _WAVEFORM_CACHE[key] = cached
+        _waveform_cache_bytes += nbytes
+        while _waveform_cache_bytes > WAVEFORM_CACHE_BYTES:
+            _, evicted = _WAVEFORM_CACHE.popitem(last=False)
+            _waveform_cache_bytes -= sum(data.nbytes for data, _ in evicted)
+    else:
+        _WAVEFORM_CACHE.move_to_end(key)
+
+    waveforms = []
+    for data, serial in cached:
+        waveform = Waveform(data)
+        waveform.serial = serial
+        waveforms.append(waveform)
+    return tuple(waveforms)
+
+
+def clear_waveform_cache():
+    """Remove all the waveforms kept in the waveform cache."""
+    global _waveform_cache_bytes
+
+    _WAVEFORM_CACHE.clear()
+    _waveform_cache_bytes = 0
 
 
 class PulseType(Enum):
@@ -113,6 +193,20 @@ class ShapeInitError(RuntimeError):
         super().__init__(msg, *args)
 
 
+@lru_cache(maxsize=256)
+def _parse_shape(value: str) -> tuple[str, tuple[str, ...]]:
+    """Split the string representation of a shape into its name and
+    parameters.
+
+    Platforms use a handful of distinct shape strings, so the parsing is
+    cached and each string is matched only once.
+    """
+    # TODO: create multiple tests to prove regex working correctly
+    shape_name = SHAPE_NAME_PATTERN.findall(value)[0]
+    shape_parameters = tuple(SHAPE_PARAMETER_PATTERN.findall(value)[1:])
+    return shape_name, shape_parameters
+
+
 class PulseShape(ABC):
     """Abstract class for pulse shapes.
 
@@ -139,14 +233,38 @@ class PulseShape(ABC):
     ) -> Waveform:  # pragma: no cover
         raise NotImplementedError
 
+    def _cache_key(self, *args):
+        """Key identifying the waveforms generated by this shape in the
+        waveform cache.
+
+        The key contains the shape parameters and the given pulse
+        parameters. ``None`` is returned if some shape parameters are
+        not hashable, in which case the waveforms are not cached.
+        """
+        params = tuple(
+            sorted((k, v) for k, v in vars(self).items() if k not in ("pulse", "name"))
+        )
+        try:
+            hash(params)
+        except TypeError:
+            return None
+        return (type(self), params) + args
+
     def envelope_waveforms(
         self, sampling_rate=SAMPLING_RATE
     ):  #  -> tuple[Waveform, Waveform]:  # pragma: no cover
         """A tuple with the i and q envelope waveforms of the pulse."""
 
-        return (
-            self.envelope_waveform_i(sampling_rate),
-            self.envelope_waveform_q(sampling_rate),
+        pulse = self.pulse
+        key = self._cache_key(
+            "envelope", pulse.duration, pulse.amplitude, sampling_rate
+        )
+        return _cached_waveforms(
+            key,
+            lambda: (
+                self.envelope_waveform_i(sampling_rate),
+                self.envelope_waveform_q(sampling_rate),
+            ),
         )
 
     def modulated_waveform_i(self, sampling_rate=SAMPLING_RATE) -> Waveform:
@@ -163,44 +281,65 @@ class PulseShape(ABC):
 
     def modulated_waveforms(self, sampling_rate=SAMPLING_RATE):
         """A tuple with the i and q waveforms of the pulse, modulated with its
-        frequency."""
+        frequency.
+
+        Waveforms are cached, so that pulses with the same parameters
+        are modulated only once.
+        """
+
+        pulse = self.pulse
+        key = self._cache_key(
+            "modulated",
+            pulse.duration,
+            pulse.amplitude,
+            pulse._if,
+            pulse.global_phase + pulse.relative_phase,
+            sampling_rate,
+        )
+        return _cached_waveforms(key, lambda: self._modulated_waveforms(sampling_rate))
 
+    def _modulated_waveforms(self, sampling_rate):
         pulse = self.pulse
         if abs(pulse._if) * 2 > sampling_rate:
             log.info(
                 f"WARNING: The frequency of pulse {pulse.serial} is higher than the nyqusit frequency ({int(sampling_rate // 2)}) for the device sampling rate: {int(sampling_rate)}"
             )
         num_samples = int(np.rint(pulse.duration * sampling_rate))
-        time = np.arange(num_samples) / sampling_rate
         global_phase = pulse.global_phase
-        cosalpha = np.cos(
-            2 * np.pi * pulse._if * time + global_phase + pulse.relative_phase
-        )
-        sinalpha = np.sin(
-            2 * np.pi * pulse._if * time + global_phase + pulse.relative_phase
-        )
 
-        mod_matrix = np.array([[cosalpha, -sinalpha], [sinalpha, cosalpha]]) / np.sqrt(
-            2
-        )
-
-        (envelope_waveform_i, envelope_waveform_q) = self.envelope_waveforms(
+        # the same buffer holds time, phase, sine and finally the q component
+        phase = np.arange(num_samples) / sampling_rate
+        phase *= 2 * np.pi * pulse._if
+        phase += global_phase
+        phase += pulse.relative_phase
+        cosalpha = np.cos(phase)
+        cosalpha /= np.sqrt(2)
+        sinalpha = np.sin(phase, out=phase)
+        sinalpha /= np.sqrt(2)
+
+        envelope_waveform_i, envelope_waveform_q = self.envelope_waveforms(
             sampling_rate
         )
-        result = []
-        for n, t, ii, qq in zip(
-            np.arange(num_samples),
-            time,
-            envelope_waveform_i.data,
-            envelope_waveform_q.data,
-        ):
-            result.append(mod_matrix[:, :, n] @ np.array([ii, qq]))
-        mod_signals = np.array(result)
-
-        modulated_waveform_i = Waveform(mod_signals[:, 0])
-        modulated_waveform_i.serial = f"Modulated_Waveform_I(num_samples = {num_samples}, amplitude = {format(pulse.amplitude, '.6f').rstrip('0').rstrip('.')}, shape = {str(pulse.shape)}, frequency = {format(pulse._if, '_')}, phase = {format(global_phase + pulse.relative_phase, '.6f').rstrip('0').rstrip('.')})"
-        modulated_waveform_q = Waveform(mod_signals[:, 1])
-        modulated_waveform_q.serial = f"Modulated_Waveform_Q(num_samples = {num_samples}, amplitude = {format(pulse.amplitude, '.6f').rstrip('0').rstrip('.')}, shape = {str(pulse.shape)}, frequency = {format(pulse._if, '_')}, phase = {format(global_phase + pulse.relative_phase, '.6f').rstrip('0').rstrip('.')})"
+        envelope_i = envelope_waveform_i.data
+        envelope_q = envelope_waveform_q.data
+
+        # most shapes have no q component, its contribution is skipped
+        has_q = envelope_q.any()
+        modulated_i = cosalpha * envelope_i
+        if has_q:
+            modulated_i -= sinalpha * envelope_q
+        modulated_q = sinalpha
+        modulated_q *= envelope_i
+        if has_q:
+            cosalpha *= envelope_q
+            modulated_q += cosalpha
+
+        # the serials of both components share the same parameters
+        parameters = f"num_samples = {num_samples}, amplitude = {format(pulse.amplitude, '.6f').rstrip('0').rstrip('.')}, shape = {str(pulse.shape)}, frequency = {format(pulse._if, '_')}, phase = {format(global_phase + pulse.relative_phase, '.6f').rstrip('0').rstrip('.')}"
+        modulated_waveform_i = Waveform(modulated_i)
+        modulated_waveform_i.serial = f"Modulated_Waveform_I({parameters})"
+        modulated_waveform_q = Waveform(modulated_q)
+        modulated_waveform_q.serial = f"Modulated_Waveform_Q({parameters})"
         return (modulated_waveform_i, modulated_waveform_q)
 
     def __eq__(self, item) -> bool:
@@ -215,11 +354,9 @@ class PulseShape(ABC):
 
             To be replaced by proper serialization.
         """
-        shape_name = re.findall(r"(\w+)", value)[0]
+        shape_name, shape_parameters = _parse_shape(value)
         if shape_name not in globals():
             raise ValueError(f"shape {value} not found")
-        shape_parameters = re.findall(r"[-\w+\d\.\d]+", value)[1:]
-        # TODO: create multiple tests to prove regex working correctly
         return globals()[shape_name](*shape_parameters)
 
 
@@ -551,9 +688,10 @@ class IIR(PulseShape):
                 a=self.a,
                 x=self.target.envelope_waveform_i(sampling_rate).data,
             )
-            if not np.max(np.abs(data)) == 0:
-                data = data / np.max(np.abs(data))
-            data = np.abs(self.pulse.amplitude) * data
+            peak = np.max(np.abs(data))
+            if not peak == 0:
+                data /= peak
+            data *= np.abs(self.pulse.amplitude)
             waveform = Waveform(data)
             waveform.serial = f"Envelope_Waveform_I(num_samples = {num_samples}, amplitude = {format(self.pulse.amplitude, '.6f').rstrip('0').rstrip('.')}, shape = {repr(self)})"
             return waveform
@@ -573,9 +711,10 @@ class IIR(PulseShape):
                 a=self.a,
                 x=self.target.envelope_waveform_q(sampling_rate).data,
             )
-            if not np.max(np.abs(data)) == 0:
-                data = data / np.max(np.abs(data))
-            data = np.abs(self.pulse.amplitude) * data
+            peak = np.max(np.abs(data))
+            if not peak == 0:
+                data /= peak
+            data *= np.abs(self.pulse.amplitude)
             waveform = Waveform(data)
             waveform.serial = f"Envelope_Waveform_Q(num_samples = {num_samples}, amplitude = {format(self.pulse.amplitude, '.6f').rstrip('0').rstrip('.')}, shape = {repr(self)})"
             return waveform
@@ -844,10 +983,7 @@ class Pulse:
     ):  #  -> tuple[Waveform, Waveform]:
         """A tuple with the i and q envelope waveforms of the pulse."""
 
-        return (
-            self.shape.envelope_waveform_i(sampling_rate),
-            self.shape.envelope_waveform_q(sampling_rate),
-        )
+        return self.shape.envelope_waveforms(sampling_rate)
 
     def modulated_waveform_i(self, sampling_rate=SAMPLING_RATE) -> Waveform:
         """The waveform of the i component of the pulse, modulated with its
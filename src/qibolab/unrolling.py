@@ -3,9 +3,11 @@
 May be reused by different instruments.
 """
 
-from dataclasses import asdict, dataclass, field, fields
+from dataclasses import asdict, astuple, dataclass, field, fields
 from functools import total_ordering
 
+import numpy as np
+
 from .pulses import PulseSequence
 
 
@@ -65,15 +67,30 @@ def batch(sequences: list[PulseSequence], bounds: Bounds):
 
     Takes into account the various limitations throught the mechanics defined in
     :cls:`Bounds`, and the numerical limitations specified by the `bounds` argument.
+
+    The sizes of all sequences are counted once and accumulated, so that the
+    boundaries of each batch are found by bisection. A sequence exceeding the
+    bounds on its own is placed in a dedicated batch.
     """
-    counters = Bounds(0, 0, 0)
-    batch = []
-    for sequence in sequences:
-        update = Bounds.update(sequence)
-        if counters + update > bounds:
-            yield batch
-            counters, batch = update, [sequence]
-        else:
-            batch.append(sequence)
-            counters += update
-    yield batch
+    counters = [f.metadata["count"] for f in fields(Bounds)]
+    sizes = np.array(
+        [[count(sequence) for count in counters] for sequence in sequences]
+    ).reshape(len(sequences), len(counters))
+    cumulative = np.cumsum(sizes, axis=0)
+    limits = np.array(astuple(bounds))
+
+    if len(sequences) == 0:
+        yield []
+        return
+
+    start = 0
+    offset = np.zeros(len(counters))
+    while start < len(sequences):
+        end = min(
+            np.searchsorted(column, limit, side="right")
+            for column, limit in zip(cumulative.T, offset + limits)
+        )
+        end = max(end, start + 1)
+        yield sequences[start:end]
+        offset = cumulative[end - 1]
+        start = end
@@ -226,3 +226,21 @@ def test_align_delay_measurement(platform, delay):
     MZ_pulse = platform.create_MZ_pulse(0, start=delay)
     s = PulseSequence(MZ_pulse)
     assert sequence.serial == s.serial
+
+
+def test_compile_two_qubit_gate_timing():
+    platform = create_platform("dummy_couplers")
+    circuit = Circuit(5)
+    circuit.add(gates.GPI2(0, 0.1))
+    circuit.add(gates.CZ(0, 2))
+    circuit.add(gates.GPI2(1, 0.2))
+    circuit.add(gates.GPI2(2, 0.3))
+    circuit.add(gates.M(0, 1, 2))
+
+    sequence = compile_circuit(circuit, platform)
+    gpi2 = platform.create_RX90_pulse(0)
+    cz, _ = platform.create_CZ_pulse_sequence((0, 2))
+    cz_finish = gpi2.duration + cz.duration
+    assert [pulse.start for pulse in sequence.qd_pulses] == [0, 0, cz_finish]
+    for pulse in sequence.ro_pulses:
+        assert pulse.start == cz_finish + gpi2.duration
@@ -1,6 +1,6 @@
 import pytest
 
-from qibolab.instruments.erasynth import ERA
+from qibolab.instruments.erasynth import ERA, ERASynthEthernet
 
 from .conftest import get_instrument
 
@@ -24,3 +24,68 @@ def test_instruments_erasynth_setup(era):
     assert era.power == -10
     era.frequency = original_frequency
     era.power = original_power
+
+
+@pytest.fixture
+def ethernet(mocker):
+    post = mocker.patch("requests.Session.post")
+    post.return_value.status_code = 200
+    post.return_value.content = (
+        b'{"frequency": 5000000000, "power": -10.0, "reference_int_ext": 1}'
+    )
+    device = ERASynthEthernet("era", "192.168.0.1")
+    post.reset_mock()
+    return device, post
+
+
+def test_instruments_erasynth_ethernet_get_cache(ethernet):
+    device, post = ethernet
+    assert device.get("frequency") == 5000000000
+    assert device.get("power") == -10.0
+    assert device.get("ref_osc_source") == "EXT"
+    assert post.call_count == 1
+    device.set("power", -5)
+    device.get("power")
+    assert post.call_count == 3
+    device.get_all(refresh=True)
+    assert post.call_count == 4
+
+
+def test_instruments_erasynth_ethernet_get_all_copy(ethernet):
+    device, post = ethernet
+    values = device.get_all()
+    values["power"] = 0.0
+    assert device.get("power") == -10.0
+    assert device.get_all() is not values
+    assert post.call_count == 1
+
+
+def test_instruments_erasynth_ethernet_set_many(ethernet):
+    device, post = ethernet
+    device.set_many({"frequency": 5e9, "power": -10, "ref_osc_source": "ext"})
+    assert post.call_count == 1
+    assert post.call_args.kwargs["data"] == {
+        "frequency": "5000000000",
+        "power": "-10.0",
+        "reference_int_ext": "1",
+    }
+
+
+def test_instruments_erasynth_ethernet_ref_osc_source(ethernet):
+    device, post = ethernet
+    device.set("ref_osc_source", "INTERNAL")
+    assert post.call_args.kwargs["data"] == {"reference_int_ext": "0"}
+    with pytest.raises(ValueError):
+        device.set("ref_osc_source", "unknown")
+
+
+def test_instruments_erasynth_ethernet_connect_error(mocker):
+    sleep = mocker.patch("qibolab.instruments.oscillator.time.sleep")
+    era = ERA("era", "0.0.0.0")
+    create = mocker.patch.object(era, "create", side_effect=ConnectionError)
+    with pytest.raises(RuntimeError):
+        era.connect()
+    assert not era.is_connected
+    # requests are already retried by the ethernet driver
+    create.assert_called_once()
+    sleep.assert_not_called()
@@ -0,0 +1,154 @@
+"""Tests for the IcarusQ RFSoC driver."""
+
+import importlib
+import sys
+
+import numpy as np
+import pytest
+
+from qibolab.execution_parameters import AveragingMode, ExecutionParameters
+from qibolab.pulses import (
+    Drag,
+    DrivePulse,
+    FluxPulse,
+    Gaussian,
+    PulseSequence,
+    ReadoutPulse,
+    Rectangular,
+)
+from qibolab.result import AveragedIntegratedResults, IntegratedResults
+
+ADC_SAMPLING_RATE = 1966.08
+ADC_SAMPLE_SIZE = 1024
+DAC_SAMPLING_RATE = 5898.24
+DAC_MAX_AMPLITUDE = 32767
+DAC_MAX_SAMPLES = 4096
+
+
+@pytest.fixture
+def icarusqfpga(mocker, monkeypatch):
+    """Import the driver module with a stub of the IcarusQ RFSoC package.
+
+    The tests mock the device, so the proprietary driver is not needed.
+    """
+    driver = mocker.MagicMock()
+    monkeypatch.setitem(sys.modules, "icarusq_rfsoc_driver", driver)
+    monkeypatch.setitem(
+        sys.modules, "icarusq_rfsoc_driver.rfsoc_settings", driver.rfsoc_settings
+    )
+    monkeypatch.delitem(sys.modules, "qibolab.instruments.icarusqfpga", raising=False)
+    yield importlib.import_module("qibolab.instruments.icarusqfpga")
+    sys.modules.pop("qibolab.instruments.icarusqfpga", None)
+
+
+def test_play(mocker, icarusqfpga):
+    """Compare the uploaded waveforms with pulses modulated one at a time."""
+    instrument = icarusqfpga.RFSOC("icarus", "0.0.0.0")
+    instrument.device = mocker.Mock(
+        dac=[mocker.Mock(max_samples=DAC_MAX_SAMPLES) for _ in range(4)],
+        dac_sampling_rate=DAC_SAMPLING_RATE,
+        dac_max_amplitude=DAC_MAX_AMPLITUDE,
+    )
+    instrument.ports("L2-1").dac = 0
+    instrument.ports("L2-2").dac = 1
+    instrument.ports("L4-1").dac = 3
+
+    sequence = PulseSequence()
+    # pulses of equal length are modulated together, on the same and on different DACs
+    sequence.add(DrivePulse(0, 40, 0.9, 100e6, 0, Drag(5, 0.2), "L2-1", qubit=0))
+    sequence.add(DrivePulse(40, 40, 0.7, 100e6, 1.2, Drag(5, 0.2), "L2-1", qubit=0))
+    sequence.add(DrivePulse(10, 40, 0.5, 250e6, 0.4, Gaussian(5), "L2-2", qubit=1))
+    sequence.add(DrivePulse(60, 100, 0.3, 250e6, 0, Gaussian(5), "L2-2", qubit=1))
+    sequence.add(DrivePulse(90, 70, 0.2, 120e6, 0.8, Rectangular(), "L2-1", qubit=0))
+    sequence.add(FluxPulse(20, 80, 0.4, Rectangular(), "L4-1", qubit=0))
+    # channels without a port are not played by this instrument
+    sequence.add(DrivePulse(0, 40, 0.9, 100e6, 0, Drag(5, 0.2), "L2-5", qubit=2))
+
+    instrument.play({}, {}, sequence, ExecutionParameters())
+    (payload,), _ = instrument.device.upload_waveform.call_args
+    uploaded = {dac: (wfm, end_addr) for dac, wfm, end_addr in payload}
+
+    sampling_rate = DAC_SAMPLING_RATE * 1e6
+    expected = {}
+    for pulse in sequence:
+        if pulse.channel not in instrument._ports:
+            continue
+        dac = instrument.ports(pulse.channel).dac
+        start = int(pulse.start * 1e-9 * sampling_rate)
+        i_env = pulse.envelope_waveform_i(sampling_rate / 1e9).data
+        q_env = pulse.envelope_waveform_q(sampling_rate / 1e9).data
+        end = start + len(i_env)
+        if pulse.channel == "L4-1":
+            wfm = i_env
+        else:
+            t = np.arange(start, end) / sampling_rate
+            phase = 2 * np.pi * pulse.frequency * t + pulse.relative_phase
+            wfm = i_env * np.sin(phase) + q_env * np.cos(phase)
+        wfm_array, end_addr = expected.get(dac, (np.zeros(DAC_MAX_SAMPLES), 0))
+        wfm_array[start:end] += DAC_MAX_AMPLITUDE * wfm
+        expected[dac] = (wfm_array, max(end >> 4, end_addr))
+
+    # only the DACs playing pulses are uploaded, in double precision
+    assert uploaded.keys() == expected.keys() == {0, 1, 3}
+    for dac, (wfm, end_addr) in expected.items():
+        assert uploaded[dac][0].dtype == np.float64
+        assert uploaded[dac][1] == end_addr
+        np.testing.assert_allclose(uploaded[dac][0], wfm)
+
+
+@pytest.mark.parametrize("nshots", [None, 5])
+def test_process_readout_signal(mocker, icarusqfpga, nshots):
+    """Demodulate a tone of known amplitude and phase on the ADC.
+
+    The raw signal is either a single trace or a ``(shots, samples)``
+    array.
+    """
+    instrument = icarusqfpga.RFSOC_RO("icarus", "0.0.0.0")
+    instrument.device = mocker.Mock(
+        adc_sampling_rate=ADC_SAMPLING_RATE, adc_sample_size=ADC_SAMPLE_SIZE
+    )
+    qubit = mocker.Mock()
+    qubit.readout.ports = ("L3-1", 2)
+
+    # integer number of periods in the acquisition window
+    frequency = 100 * ADC_SAMPLING_RATE * 1e6 / ADC_SAMPLE_SIZE
+    pulse = ReadoutPulse(0, 500, 0.5, frequency, 0, Rectangular(), "L3-1", qubit=0)
+
+    if nshots is None:
+        amplitudes = np.array(0.3)
+    else:
+        amplitudes = np.linspace(0.1, 0.5, nshots)
+    phase = 0.3
+    t = np.arange(ADC_SAMPLE_SIZE) / (ADC_SAMPLING_RATE * 1e6)
+    raw_signal = amplitudes[..., np.newaxis] * np.cos(2 * np.pi * frequency * t + phase)
+
+    options = ExecutionParameters(averaging_mode=AveragingMode.SINGLESHOT)
+    results = instrument.process_readout_signal(
+        {2: raw_signal}, [pulse], {0: qubit}, options
+    )
+    result = results[pulse.serial]
+    assert isinstance(result, IntegratedResults)
+    assert results[pulse.qubit] is result
+    assert result.voltage.shape == amplitudes.shape
+    # i is the projection on the cosine and q on the sine of the readout frequency
+    expected_i = raw_signal @ np.cos(2 * np.pi * frequency * t)
+    expected_q = raw_signal @ np.sin(2 * np.pi * frequency * t)
+    np.testing.assert_allclose(result.voltage_i, expected_i)
+    np.testing.assert_allclose(result.voltage_q, expected_q)
+    np.testing.assert_allclose(
+        result.voltage_i, amplitudes * ADC_SAMPLE_SIZE / 2 * np.cos(phase)
+    )
+    np.testing.assert_allclose(
+        result.voltage_q, -amplitudes * ADC_SAMPLE_SIZE / 2 * np.sin(phase)
+    )
+
+    if nshots is None:
+        return
+    options = ExecutionParameters(averaging_mode=AveragingMode.CYCLIC)
+    results = instrument.process_readout_signal(
+        {2: raw_signal}, [pulse], {0: qubit}, options
+    )
+    result = results[pulse.serial]
+    assert isinstance(result, AveragedIntegratedResults)
+    np.testing.assert_allclose(result.voltage_i, np.mean(expected_i))
+    np.testing.assert_allclose(result.voltage_q, np.mean(expected_q))
@@ -30,3 +30,76 @@ def test_oscillator_setup(lo):
     lo.setup(frequency=5e9, power=0)
     assert lo.frequency == 5e9
     assert lo.power == 0
+
+
+def test_oscillator_connect_sync(lo, mocker):
+    lo.setup(frequency=5e9)
+    get = mocker.spy(DummyDevice, "get")
+    set_ = mocker.spy(DummyDevice, "set")
+    lo.connect()
+    assert lo.frequency == 5e9
+    assert lo.power == 0
+    assert lo.ref_osc_source == 0
+    assert get.call_count == 2
+    set_.assert_called_once_with(lo.device, "frequency", 5e9)
+    lo.disconnect()
+
+
+def test_oscillator_connect_retry(lo, mocker):
+    sleep = mocker.patch("qibolab.instruments.oscillator.time.sleep")
+    create = mocker.patch.object(
+        lo, "create", side_effect=[ConnectionError, DummyDevice()]
+    )
+    lo.connect()
+    assert lo.is_connected
+    assert create.call_count == 2
+    sleep.assert_called_once()
+    lo.disconnect()
+
+
+def test_oscillator_connect_error(lo, mocker):
+    mocker.patch("qibolab.instruments.oscillator.time.sleep")
+    mocker.patch.object(lo, "create", side_effect=ConnectionError)
+    with pytest.raises(RuntimeError):
+        lo.connect()
+    assert not lo.is_connected
+
+
+def test_oscillator_connect_unexpected_error(lo, mocker):
+    sleep = mocker.patch("qibolab.instruments.oscillator.time.sleep")
+    create = mocker.patch.object(lo, "create", side_effect=ValueError)
+    with pytest.raises(ValueError):
+        lo.connect()
+    assert not lo.is_connected
+    create.assert_called_once()
+    sleep.assert_not_called()
+
+
+def test_oscillator_context_manager(lo):
+    with lo as connected:
+        assert connected is lo
+        assert lo.is_connected
+    assert not lo.is_connected
+
+
+def test_oscillator_finalizer(mocker):
+    close = mocker.spy(DummyDevice, "close")
+    lo = DummyLocalOscillator("lo", "0")
+    lo.connect()
+    assert not lo._finalizer.atexit
+    del lo
+    close.assert_called_once()
+
+
+def test_oscillator_sync_snapshot(lo, mocker):
+    lo.connect()
+    get = mocker.spy(DummyDevice, "get")
+    lo.settings.power = None
+    lo.sync("power", {"power": -5})
+    assert lo.power == -5
+    get.assert_not_called()
+    lo.settings.power = None
+    lo.sync("power", {})
+    assert lo.power == 0
+    get.assert_called_once()
+    lo.disconnect()
@@ -174,3 +174,20 @@ def test_sweepers(connected_platform, connected_qcm_bb: QcmBb):
     )
     connected_qcm_bb.upload()
     connected_qcm_bb.play_sequence()
+
+
+def test_upload_sequence_cache(controller, mocker):
+    qcm_bb = get_qcm_bb(controller)
+    qcm_bb.device = mocker.MagicMock()
+    sequence = {
+        "waveforms": {"wf": {"data": [0.0, 0.5], "index": 0}},
+        "weights": {},
+        "acquisitions": {},
+        "program": "stop",
+    }
+    qcm_bb._upload_sequence(0, sequence)
+    qcm_bb._upload_sequence(0, dict(sequence))
+    qcm_bb.device.sequencers[0].sequence.assert_called_once_with(sequence)
+
+    qcm_bb._upload_sequence(0, dict(sequence, program="nop\nstop"))
+    assert qcm_bb.device.sequencers[0].sequence.call_count == 2
@@ -2,6 +2,7 @@ import numpy as np
 import pytest
 
 from qibolab.instruments.abstract import Instrument
+from qibolab.instruments.qblox.acquisition import demodulate
 from qibolab.instruments.qblox.cluster_qrm_rf import QrmRf
 from qibolab.instruments.qblox.port import QbloxInputPort, QbloxOutputPort
 from qibolab.pulses import DrivePulse, PulseSequence, ReadoutPulse
@@ -224,3 +225,20 @@ def test_sweepers(connected_platform, connected_qrm_rf: QrmRf):
 
 def test_process_acquisition_results():
     pass
+
+
+def test_demodulate():
+    rng = np.random.default_rng(0)
+    input_i, input_q = rng.normal(size=(2, 1000))
+    frequency = 20e-3
+
+    modulated_i = input_i - np.mean(input_i)
+    modulated_q = input_q - np.mean(input_q)
+    phase = 2 * np.pi * frequency * np.arange(1000)
+    cosalpha, sinalpha = np.cos(phase), np.sin(phase)
+    expected_i = 2 * np.mean(cosalpha * modulated_i + sinalpha * modulated_q)
+    expected_q = 2 * np.mean(-sinalpha * modulated_i + cosalpha * modulated_q)
+
+    np.testing.assert_allclose(
+        demodulate(input_i, input_q, frequency), [expected_i, expected_q]
+    )
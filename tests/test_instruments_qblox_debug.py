@@ -0,0 +1,33 @@
+import json
+
+import numpy as np
+import pytest
+
+from qibolab.instruments.qblox import debug
+from qibolab.instruments.qblox.debug import save_sequence
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_save_sequence(tmp_path, mocker, use_orjson):
+    if not use_orjson:
+        mocker.patch.object(debug, "orjson", None)
+    program = "play 0,1,4\nstop\n"
+    sequence = {
+        "waveforms": {"wf": {"data": np.linspace(0, 1, 5).tolist(), "index": 0}},
+        "weights": {},
+        "acquisitions": {},
+        "program": program,
+    }
+    filename = tmp_path / "sequence.json"
+    save_sequence(filename, sequence, program)
+
+    content = filename.read_text()
+    assert content.endswith(program)
+    # the dump is meant to be read, so it is indented
+    first, second = content.splitlines()[:2]
+    assert first == "{"
+    assert second.startswith(" ") and second.lstrip().startswith('"waveforms"')
+    saved = json.loads(content[: -len(program)])
+    np.testing.assert_allclose(saved["waveforms"]["wf"]["data"], np.linspace(0, 1, 5))
+    assert saved["program"] == program
+    assert saved["waveforms"]["wf"]["index"] == 0
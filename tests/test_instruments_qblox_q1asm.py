@@ -0,0 +1,31 @@
+import pytest
+
+from qibolab.instruments.qblox.q1asm import (
+    Program,
+    Register,
+    _decompose_wait,
+    wait_block,
+)
+
+
+@pytest.mark.parametrize("wait_time", [0, 3, 4, 1000, 2**16, 2**16 + 1, 10**8 + 2])
+def test_decompose_wait(wait_time):
+    n_loops, loop_wait, wait = _decompose_wait(wait_time)
+    assert n_loops * loop_wait + wait == max(wait_time, 4 if wait_time > 0 else 0)
+    assert loop_wait < 2**16 and wait < 2**16
+    assert wait == 0 or wait >= 4
+
+
+def test_decompose_wait_errors():
+    with pytest.raises(ValueError):
+        _decompose_wait(-1)
+    with pytest.raises(ValueError):
+        _decompose_wait(2**32)
+
+
+def test_wait_block():
+    block = wait_block(10**6 + 2, Register(Program(), "wait"))
+    n_loops, loop_wait, wait = _decompose_wait(10**6 + 2)
+    assert f"move {n_loops}, " in repr(block)
+    assert f"wait {loop_wait}" in repr(block)
+    assert f"wait {wait}" in repr(block)
@@ -19,6 +19,7 @@ from qibolab.pulses import (
     IIR,
     SNZ,
     CouplerFluxPulse,
+    Custom,
     Drag,
     FluxPulse,
     Gaussian,
@@ -64,6 +65,27 @@ def test_zhpulse_pulse_conversion(pulse):
         assert zhpulse.length == 40e-9
 
 
+def test_zhpulse_complex_samples():
+    envelope_i = np.linspace(0, 1, 40)
+    envelope_q = np.linspace(1, 0, 40)
+    pulse = Pulse(
+        0, 40, 0.5, int(3e9), 0.0, Custom(envelope_i, envelope_q), "ch0", qubit=0
+    )
+    zhpulse = ZhPulse(pulse).zhpulse
+    np.testing.assert_allclose(zhpulse.samples, 0.5 * (envelope_i + 1j * envelope_q))
+
+
+def test_zhpulse_sampled_cache():
+    def shape():
+        return IIR([10, 1], [0.4, 1], target=Gaussian(5))
+
+    pulse = Pulse(0, 40, 0.05, int(3e9), 0.0, shape(), "ch0", qubit=0)
+    same = Pulse(100, 40, 0.05, int(3e9), 0.0, shape(), "ch1", qubit=1)
+    other = Pulse(0, 40, 0.1, int(3e9), 0.0, shape(), "ch0", qubit=0)
+    assert ZhPulse(pulse).zhpulse is ZhPulse(same).zhpulse
+    assert ZhPulse(pulse).zhpulse is not ZhPulse(other).zhpulse
+
+
 def test_zhpulse_add_sweeper():
     pulse = Pulse(0, 40, 0.05, int(3e9), 0.0, Gaussian(5), "ch", qubit=0)
     zhpulse = ZhPulse(pulse)
@@ -135,6 +157,9 @@ def test_classify_sweepers(dummy_qrc):
     assert bias_sweeper in nt_sweeps
     assert readout_amplitude_sweeper in nt_sweeps
 
+    empty_sweeper = Sweeper(Parameter.amplitude, np.array([1, 2, 3]), [])
+    assert classify_sweepers([empty_sweeper]) == ([], [empty_sweeper])
+
 
 def test_processed_sweeps_pulse_properties(dummy_qrc):
     platform = create_platform("zurich")
@@ -183,6 +208,25 @@ def test_processed_sweeps_pulse_properties(dummy_qrc):
     assert processed_sweeps.channels_with_sweeps() == set()
 
 
+def test_play_sweep_preserves_sweeper_values(dummy_qrc, mocker):
+    platform = create_platform("zurich")
+    pulse = Pulse(0, 40, 0.05, int(3e9), 0.0, Gaussian(5), "ch0", qubit=0)
+    values = np.array([0.5, 1.0, 2.0])
+    sweeper = Sweeper(Parameter.amplitude, values.copy(), [pulse])
+    processed_sweeps = ProcessedSweeps([sweeper], platform.qubits)
+
+    zhpulse = ZhPulse(pulse)
+    for param, sweep_param in processed_sweeps.sweeps_for_pulse(pulse):
+        zhpulse.add_sweeper(param, sweep_param)
+    exp = mocker.Mock()
+    Zurich.play_sweep(exp, "ch0", zhpulse)
+
+    np.testing.assert_array_equal(sweeper.values, values)
+    np.testing.assert_allclose(
+        exp.play.call_args.kwargs["amplitude"].values, values / 2
+    )
+
+
 def test_processed_sweeps_frequency(dummy_qrc):
     platform = create_platform("zurich")
     qubit_id, qubit = 1, platform.qubits[1]
@@ -196,6 +240,17 @@ def test_processed_sweeps_frequency(dummy_qrc):
     assert len(processed_sweeps.sweeps_for_pulse(pulse)) == 0
     assert processed_sweeps.channels_with_sweeps() == {qubit.drive.name}
     assert len(processed_sweeps.sweeps_for_channel(qubit.drive.name)) == 1
+    assert processed_sweeps.channel_frequency_sweeps() == [
+        (qubit.drive.name, processed_sweeps.sweeps_for_channel(qubit.drive.name)[0][1])
+    ]
+    ((ch, param, sweep_param),) = processed_sweeps.channel_sweeps_for_sweeper(
+        freq_sweeper
+    )
+    assert ch == qubit.drive.name
+    assert param is Parameter.frequency
+    assert processed_sweeps.sweeps_for_sweeper(freq_sweeper) == [sweep_param]
+    other_sweeper = Sweeper(Parameter.frequency, np.array([1, 2, 3]), [pulse])
+    assert processed_sweeps.channel_sweeps_for_sweeper(other_sweeper) == []
 
     with pytest.raises(ValueError):
         flux_pulse = Pulse(
@@ -277,6 +332,105 @@ def test_zhsequence(dummy_qrc):
         controller.sequence_zh("sequence", IQM5q.qubits)
 
 
+def test_create_sub_sequences(dummy_qrc):
+    platform = create_platform("zurich")
+    controller = platform.instruments["EL_ZURO"]
+    qubit = platform.qubits[0]
+
+    sequence = PulseSequence()
+    drive_pulses = [
+        platform.create_RX_pulse(0, start=0),
+        platform.create_RX_pulse(0, start=100),
+        platform.create_RX_pulse(0, start=1000),
+    ]
+    ro_pulses = [
+        platform.create_MZ_pulse(0, start=40),
+        platform.create_MZ_pulse(0, start=2000),
+    ]
+    sequence.add(*drive_pulses, *ro_pulses)
+    controller.sequence = controller.sequence_zh(sequence, platform.qubits)
+
+    sub_sequences, unsplit = controller.create_sub_sequences([qubit])
+    assert unsplit == set()
+    assert len(sub_sequences) == 2
+    assert [
+        zp.pulse for zp in sub_sequences[0].control_sequence[qubit.drive.name]
+    ] == drive_pulses[:1]
+    assert [
+        zp.pulse for zp in sub_sequences[1].control_sequence[qubit.drive.name]
+    ] == drive_pulses[1:]
+    assert [m.pulse for _, m in sub_sequences[1].measurements] == ro_pulses[1:]
+
+
+def test_create_sub_sequences_multiple_measurements(dummy_qrc):
+    platform = create_platform("zurich")
+    controller = platform.instruments["EL_ZURO"]
+    qubit = platform.qubits[0]
+
+    sequence = PulseSequence()
+    drive_pulses = [
+        platform.create_RX_pulse(0, start=0),
+        platform.create_RX_pulse(0, start=100),
+        platform.create_RX_pulse(0, start=1000),
+        platform.create_RX_pulse(0, start=3000),
+        platform.create_RX_pulse(0, start=3100),
+    ]
+    # finishes after the start of both the first and the second measurement
+    drive_pulses[1].duration = 400
+    ro_pulses = [
+        platform.create_MZ_pulse(0, start=40),
+        platform.create_MZ_pulse(0, start=300),
+        platform.create_MZ_pulse(0, start=2000),
+    ]
+    sequence.add(*drive_pulses, *ro_pulses)
+    controller.sequence = controller.sequence_zh(sequence, platform.qubits)
+
+    sub_sequences, unsplit = controller.create_sub_sequences([qubit])
+    assert unsplit == set()
+    assert len(sub_sequences) == 3
+    control = [
+        [zp.pulse for zp in sub.control_sequence.get(qubit.drive.name, [])]
+        for sub in sub_sequences
+    ]
+    # a pulse spanning several measurement starts goes after all of them
+    assert control == [drive_pulses[:1], [], drive_pulses[1:3]]
+    assert [[m.pulse for _, m in sub.measurements] for sub in sub_sequences] == [
+        [pulse] for pulse in ro_pulses
+    ]
+
+
+@pytest.mark.parametrize(
+    "acquisition_type,kernel",
+    [
+        (lo.AcquisitionType.INTEGRATION, None),
+        (lo.AcquisitionType.DISCRIMINATION, None),
+        (lo.AcquisitionType.DISCRIMINATION, np.ones(10)),
+    ],
+)
+def test_select_exp_reuses_weights(dummy_qrc, mocker, acquisition_type, kernel):
+    platform = create_platform("zurich")
+    controller = platform.instruments["EL_ZURO"]
+    qubit = platform.qubits[0]
+    qubit.kernel = kernel
+
+    sequence = PulseSequence()
+    sequence.add(platform.create_MZ_pulse(0, start=0))
+    sequence.add(platform.create_MZ_pulse(0, start=5000))
+    controller.sequence = controller.sequence_zh(sequence, platform.qubits)
+    controller.sub_sequences, controller.unsplit_channels = (
+        controller.create_sub_sequences([qubit])
+    )
+    options = ExecutionParameters(
+        relaxation_time=300e-6, acquisition_type=acquisition_type
+    )
+
+    exp = mocker.MagicMock()
+    controller.select_exp(exp, platform.qubits, options)
+    kernels = [c.kwargs["integration_kernel"] for c in exp.measure.call_args_list]
+    assert len(kernels) == 2
+    assert kernels[0] is kernels[1]
+
+
 def test_zhsequence_couplers(dummy_qrc):
     IQM5q = create_platform("zurich")
     controller = IQM5q.instruments["EL_ZURO"]
@@ -356,6 +510,23 @@ def test_zhinst_register_drive_line(dummy_qrc):
     assert "/logical_signal_groups/q0/drive_line" in IQM5q.calibration.calibration_items
 
 
+def test_zhinst_get_channel_node_path(dummy_qrc, mocker):
+    platform = create_platform("zurich")
+    IQM5q = platform.instruments["EL_ZURO"]
+    qubit = platform.qubits[0]
+    IQM5q.register_drive_line(qubit, intermediate_frequency=int(1e6))
+
+    path = IQM5q.get_channel_node_path(qubit.drive.name)
+    assert path.split("/")[0] in {
+        instrument.address for instrument in IQM5q.device_setup.instruments
+    }
+    assert IQM5q.get_channel_node_path(qubit.drive.name) == path
+
+    IQM5q.signal_map["unknown"] = mocker.Mock(path="/logical_signal_groups/unknown")
+    with pytest.raises(RuntimeError):
+        IQM5q.get_channel_node_path("unknown")
+
+
 def test_zhinst_register_flux_line(dummy_qrc):
     platform = create_platform("zurich")
     IQM5q = platform.instruments["EL_ZURO"]
@@ -404,6 +575,51 @@ def test_experiment_flow(dummy_qrc):
     assert acquire_channel_name(qubits[0]) in IQM5q.experiment.signals
 
 
+def test_run_exp_compiled_cache(dummy_qrc, mocker):
+    platform = create_platform("zurich")
+    IQM5q = platform.instruments["EL_ZURO"]
+    IQM5q.session = mocker.Mock()
+    IQM5q.processed_sweeps = ProcessedSweeps([], platform.qubits)
+    options = ExecutionParameters(
+        relaxation_time=300e-6,
+        acquisition_type=AcquisitionType.INTEGRATION,
+        averaging_mode=AveragingMode.CYCLIC,
+    )
+
+    def run(start):
+        sequence = PulseSequence()
+        sequence.add(platform.create_RX_pulse(0, start=start))
+        sequence.add(platform.create_MZ_pulse(0, start=start + 40))
+        IQM5q.experiment_flow(platform.qubits, {}, sequence, options)
+        IQM5q.run_exp()
+
+    run(0)
+    run(0)
+    assert IQM5q.session.compile.call_count == 1
+    assert IQM5q.session.run.call_count == 2
+    run(40)
+    assert IQM5q.session.compile.call_count == 2
+
+
+def test_sweep_discrimination_results(dummy_qrc, mocker):
+    platform = create_platform("zurich")
+    IQM5q = platform.instruments["EL_ZURO"]
+    IQM5q.session = mocker.Mock()
+    IQM5q.session.run.return_value.get_data.return_value = np.array([0.0, 1.0, 1.0])
+    options = ExecutionParameters(
+        nshots=3,
+        relaxation_time=300e-6,
+        acquisition_type=AcquisitionType.DISCRIMINATION,
+        averaging_mode=AveragingMode.SINGLESHOT,
+    )
+    sequence = PulseSequence()
+    ro_pulse = platform.create_MZ_pulse(0, start=0)
+    sequence.add(ro_pulse)
+
+    results = IQM5q.play(platform.qubits, {}, sequence, options)
+    np.testing.assert_array_equal(results[ro_pulse.serial].samples, [1, 0, 0])
+
+
 def test_experiment_flow_coupler(dummy_qrc):
     platform = create_platform("zurich")
     IQM5q = platform.instruments["EL_ZURO"]
@@ -786,6 +1002,48 @@ def test_experiment_sweep_punchouts(dummy_qrc, parameter):
     assert acquire_channel_name(qubits[0]) in IQM5q.experiment.signals
 
 
+@pytest.mark.parametrize(
+    "parameter,readout,spectroscopy",
+    [
+        (Parameter.frequency, True, True),
+        (Parameter.amplitude, True, True),
+        (Parameter.frequency, False, False),
+        (Parameter.duration, True, False),
+    ],
+)
+def test_sweep_spectroscopy_acquisition(
+    dummy_qrc, mocker, parameter, readout, spectroscopy
+):
+    platform = create_platform("zurich")
+    IQM5q = platform.instruments["EL_ZURO"]
+    IQM5q.session = mocker.Mock()
+    IQM5q.session.run.return_value.get_data.return_value = np.zeros(5)
+
+    qubits = {0: platform.qubits[0]}
+    sequence = PulseSequence()
+    qd_pulse = platform.create_RX_pulse(0, start=0)
+    ro_pulse = platform.create_qubit_readout_pulse(0, start=qd_pulse.finish)
+    sequence.add(qd_pulse, ro_pulse)
+
+    values = (
+        np.linspace(0.1, 0.5, 5)
+        if parameter is Parameter.amplitude
+        else 20 * np.arange(1, 6)
+    )
+    swept = ro_pulse if readout else qd_pulse
+    sweeper = Sweeper(parameter, values, pulses=[swept])
+    options = ExecutionParameters(
+        relaxation_time=300e-6,
+        acquisition_type=AcquisitionType.INTEGRATION,
+        averaging_mode=AveragingMode.CYCLIC,
+    )
+
+    IQM5q.sweep(qubits, {}, sequence, options, sweeper)
+
+    expected = lo.AcquisitionType.SPECTROSCOPY if spectroscopy else None
+    assert IQM5q.acquisition_type is expected
+
+
 def test_batching(dummy_qrc):
     platform = create_platform("zurich")
     instrument = platform.instruments["EL_ZURO"]
@@ -1,6 +1,7 @@
 """Tests :class:`qibolab.platforms.multiqubit.MultiqubitPlatform` and
 :class:`qibolab.platforms.platform.DesignPlatform`."""
 
+import importlib.machinery
 import pathlib
 import pickle
 import warnings
@@ -10,7 +11,13 @@ import pytest
 from qibo.models import Circuit
 from qibo.result import CircuitResult
 
-from qibolab import create_platform
+from qibolab import (
+    PLATFORMS,
+    create_platform,
+    get_available_platforms,
+    get_platforms_path,
+    refresh_platforms,
+)
 from qibolab.backends import QibolabBackend
 from qibolab.dummy import create_dummy
 from qibolab.dummy.platform import FOLDER
@@ -52,11 +59,45 @@ def test_create_platform(platform):
     assert isinstance(platform, Platform)
 
 
+def test_create_RX90_pulse(platform):
+    qubit = next(iter(platform.qubits))
+    pulse = platform.create_RX90_pulse(qubit, start=10, relative_phase=0.3)
+    native = platform.qubits[qubit].native_gates.RX90.pulse(10, 0.3)
+    assert pulse.serial == native.serial
+    assert pulse.amplitude == platform.qubits[qubit].native_gates.RX.amplitude / 2
+
+
 def test_create_platform_error():
     with pytest.raises(ValueError):
         platform = create_platform("nonexistent")
 
 
+def test_get_available_platforms(dummy_qrc):
+    platforms = get_available_platforms()
+    assert set(platforms) == {"qblox", "qm", "qm_octave", "rfsoc", "zurich"}
+    assert get_available_platforms() is platforms
+    refresh_platforms()
+    assert get_available_platforms() == platforms
+
+
+def test_create_platform_module_cache(dummy_qrc, mocker):
+    refresh_platforms()
+    exec_module = mocker.spy(importlib.machinery.SourceFileLoader, "exec_module")
+    first = create_platform("rfsoc")
+    second = create_platform("rfsoc")
+    assert exec_module.call_count == 1
+    assert first is not second
+    refresh_platforms()
+    create_platform("rfsoc")
+    assert exec_module.call_count == 2
+
+
+def test_get_platforms_path_error(dummy_qrc, monkeypatch):
+    monkeypatch.setenv(PLATFORMS, "/nonexistent/path")
+    with pytest.raises(RuntimeError):
+        get_platforms_path()
+
+
 def test_platform_sampling_rate(platform):
     assert platform.sampling_rate >= 1
 
@@ -23,6 +23,7 @@ from qibolab.pulses import (
     Rectangular,
     ShapeInitError,
     Waveform,
+    clear_waveform_cache,
     eCap,
 )
 
@@ -287,6 +288,14 @@ def test_drag_shape_eval(rel_sigma, beta):
     assert shape.beta == beta
 
 
+def test_pulseshape_eval_new_instances():
+    shape1 = PulseShape.eval("Drag(5, 0.1)")
+    shape2 = PulseShape.eval("Drag(5, 0.1)")
+    assert shape1 is not shape2
+    shape1.pulse = Pulse(0, 40, 0.9, 100e6, 0, shape1, 0, PulseType.DRIVE)
+    assert shape2.pulse is None
+
+
 def test_raise_shapeiniterror():
     shape = Rectangular()
     with pytest.raises(ShapeInitError):
@@ -1101,3 +1110,64 @@ def test_envelope_waveform_i_q():
     with pytest.raises(ValueError):
         custom_shape_pulse.pulse = pulse
         custom_shape_pulse.envelope_waveform_q()
+
+
+def test_modulated_waveforms_cache(mocker):
+    clear_waveform_cache()
+    generate = mocker.spy(Drag, "_modulated_waveforms")
+
+    pulse = Pulse(0, 40, 0.9, 50e6, 0, Drag(5, 2), 0, PulseType.DRIVE, 0)
+    waveform_i, waveform_q = pulse.modulated_waveforms(1)
+    waveform_i.data *= 2
+    assert generate.call_count == 1
+
+    other = Pulse(0, 40, 0.9, 50e6, 0, Drag(5, 2), 1, PulseType.DRIVE, 1)
+    other_i, other_q = other.modulated_waveforms(1)
+    assert generate.call_count == 1
+    assert other_i is not waveform_i
+    assert other_i.serial == waveform_i.serial
+    np.testing.assert_allclose(other_i.data * 2, waveform_i.data)
+    np.testing.assert_allclose(other_q.data, waveform_q.data)
+
+    other = Pulse(0, 40, 0.9, 50e6, 0, Drag(5, 1), 0, PulseType.DRIVE, 0)
+    assert other.modulated_waveforms(1)[1] != waveform_q
+    assert generate.call_count == 2
+
+    clear_waveform_cache()
+    pulse.modulated_waveforms(1)
+    assert generate.call_count == 3
+
+
+def test_waveform_cache_memory_limit(mocker, monkeypatch):
+    clear_waveform_cache()
+    generate = mocker.spy(Rectangular, "envelope_waveform_i")
+    # each pair of envelopes of 100 samples takes 1600 bytes
+    monkeypatch.setattr("qibolab.pulses.WAVEFORM_CACHE_BYTES", 4000)
+    monkeypatch.setattr("qibolab.pulses.MAX_CACHED_WAVEFORM_BYTES", 2000)
+
+    pulses = [
+        Pulse(0, 100, amplitude, 0, 0, Rectangular(), 0, PulseType.FLUX)
+        for amplitude in (0.1, 0.2, 0.3)
+    ]
+    for pulse in pulses:
+        pulse.envelope_waveforms()
+    assert generate.call_count == 3
+    # the first pair was evicted to keep the cache within the limit
+    pulses[2].envelope_waveforms()
+    assert generate.call_count == 3
+    pulses[0].envelope_waveforms()
+    assert generate.call_count == 4
+
+    # waveforms above the size limit are never cached
+    long_pulse = Pulse(0, 200, 0.1, 0, 0, Rectangular(), 0, PulseType.FLUX)
+    long_pulse.envelope_waveforms()
+    long_pulse.envelope_waveforms()
+    assert generate.call_count == 6
+    clear_waveform_cache()
+
+
+def test_envelope_waveforms_not_cached():
+    pulse = Pulse(0, 4, 0.9, 0, 0, Custom([1, 2, 3, 4]), 0, PulseType.FLUX, 0)
+    assert pulse.shape._cache_key() is None
+    waveform_i, _ = pulse.envelope_waveforms()
+    np.testing.assert_allclose(waveform_i.data, [0.9, 1.8, 2.7, 3.6])
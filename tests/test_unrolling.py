@@ -65,3 +65,19 @@ def test_batch(bounds):
 
     batches = list(batch(sequences, bounds))
     assert len(batches) > 1
+
+
+def test_batch_sizes():
+    short = PulseSequence(
+        Pulse(0, 40, 0.9, int(100e6), 0, Drag(5, 1), 1, PulseType.DRIVE),
+        Pulse(40, 1000, 0.9, int(20e6), 0, Rectangular(), 1, PulseType.READOUT),
+    )
+    long = PulseSequence(
+        Pulse(0, 400, 0.9, int(100e6), 0, Drag(5, 1), 1, PulseType.DRIVE),
+        Pulse(400, 1000, 0.9, int(20e6), 0, Rectangular(), 1, PulseType.READOUT),
+    )
+    sequences = [long, short, short, short, long, short]
+
+    batches = list(batch(sequences, Bounds(100, 10, 10)))
+    assert batches == [[long], [short, short], [short], [long], [short]]
+    assert list(batch([], Bounds(100, 10, 10))) == [[]]